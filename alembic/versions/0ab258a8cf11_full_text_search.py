@@ -0,0 +1,83 @@
+"""full text search
+
+Revision ID: 0ab258a8cf11
+Revises: e3987e07735f
+Create Date: 2026-10-17 18:03:12.440917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0ab258a8cf11'
+down_revision: Union[str, Sequence[str], None] = 'e3987e07735f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTORS = {
+    'orders': (
+        "setweight(to_tsvector('simple', coalesce(order_id, '') || ' ' || coalesce(order_reference_number, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(receiver_name, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(address, '') || ' ' || coalesce(address_2, '') || ' ' || coalesce(suburb, '')), 'C')"
+    ),
+    'order_items': "to_tsvector('simple', coalesce(product_name, ''))",
+    'customers': (
+        "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(receiver_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(address, '') || ' ' || coalesce(address_2, '') || ' ' || coalesce(suburb, '')), 'C')"
+    ),
+    'products': (
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+    ),
+}
+
+INDEXES = [
+    ("ix_orders_user_id_search_vector", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_user_id_search_vector ON orders USING gin (user_id, search_vector)"),
+    ("ix_order_items_search_vector", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_order_items_search_vector ON order_items USING gin (search_vector)"),
+    ("ix_customers_user_id_search_vector", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_customers_user_id_search_vector ON customers USING gin (user_id, search_vector)"),
+    ("ix_products_user_id_search_vector", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_user_id_search_vector ON products USING gin (user_id, search_vector)"),
+]
+
+
+def drop_invalid_index(name: str) -> None:
+    """CREATE INDEX CONCURRENTLY yang gagal meninggalkan index INVALID, dan IF NOT EXISTS
+    menganggapnya sudah ada. Index seperti itu di-drop dulu supaya dibuat ulang."""
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_index
+                WHERE indexrelid = to_regclass('{name}') AND NOT indisvalid
+            ) THEN
+                DROP INDEX {name};
+            END IF;
+        END $$
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gin supaya user_id bisa masuk ke GIN index yang sama dengan tsvector
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    # Kolom generated STORED me-rewrite tabel, jalankan di luar jam sibuk
+    for table, expression in SEARCH_VECTORS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(expression, persisted=True), nullable=True))
+
+    with op.get_context().autocommit_block():
+        for name, statement in INDEXES:
+            drop_invalid_index(name)
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    for table in reversed(list(SEARCH_VECTORS)):
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,61 @@
+"""unique product name per user
+
+Revision ID: 42dd15b09a19
+Revises: 792c9780d79c
+Create Date: 2026-10-17 11:40:27.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '42dd15b09a19'
+down_revision: Union[str, Sequence[str], None] = '792c9780d79c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def drop_invalid_index(name: str) -> None:
+    """CREATE INDEX CONCURRENTLY yang gagal meninggalkan index INVALID, dan IF NOT EXISTS
+    menganggapnya sudah ada. Index seperti itu di-drop dulu supaya dibuat ulang."""
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_index
+                WHERE indexrelid = to_regclass('{name}') AND NOT indisvalid
+            ) THEN
+                DROP INDEX {name};
+            END IF;
+        END $$
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplikat nama per user (case-insensitive) tidak dihapus: yang paling lama tetap,
+    # sisanya diberi suffix id supaya datanya tetap ada dan bisa dirapikan user
+    op.execute(
+        """
+        UPDATE products p
+        SET name = left(p.name, 244) || ' (' || left(p.id::text, 8) || ')'
+        FROM products q
+        WHERE p.user_id = q.user_id
+          AND lower(p.name) = lower(q.name)
+          AND (p.created_at, p.id) > (q.created_at, q.id)
+        """
+    )
+    with op.get_context().autocommit_block():
+        drop_invalid_index('uq_products_user_id_lower_name')
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_products_user_id_lower_name ON products (user_id, lower(name))")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_products_user_id_lower_name")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_user_id_lower_name ON products (user_id, lower(name))")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_products_user_id_lower_name")
@@ -0,0 +1,40 @@
+"""upload objects
+
+Revision ID: 5c9e2f7a4d13
+Revises: d42f8a6b1c07
+Create Date: 2026-10-17 21:03:27.164809
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c9e2f7a4d13'
+down_revision: Union[str, Sequence[str], None] = 'd42f8a6b1c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('upload_objects',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=True),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_uploaded_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index('ix_upload_objects_sha256', 'upload_objects', ['sha256'], unique=False)
+    op.create_index('ix_upload_objects_unreferenced', 'upload_objects', ['last_uploaded_at'], unique=False, postgresql_where=sa.text('ref_count <= 0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_upload_objects_unreferenced', table_name='upload_objects', postgresql_where=sa.text('ref_count <= 0'))
+    op.drop_index('ix_upload_objects_sha256', table_name='upload_objects')
+    op.drop_table('upload_objects')
@@ -0,0 +1,93 @@
+"""customer name key
+
+Revision ID: 64ef9077c010
+Revises: 42dd15b09a19
+Create Date: 2026-10-17 13:05:51.662480
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '64ef9077c010'
+down_revision: Union[str, Sequence[str], None] = '42dd15b09a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def drop_invalid_index(name: str) -> None:
+    """CREATE INDEX CONCURRENTLY yang gagal meninggalkan index INVALID, dan IF NOT EXISTS
+    menganggapnya sudah ada. Index seperti itu di-drop dulu supaya dibuat ulang."""
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_index
+                WHERE indexrelid = to_regclass('{name}') AND NOT indisvalid
+            ) THEN
+                DROP INDEX {name};
+            END IF;
+        END $$
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('customers', sa.Column(
+        'name_key',
+        sa.String(length=255),
+        sa.Computed("lower(regexp_replace(btrim(name), '\\s+', ' ', 'g'))", persisted=True),
+        nullable=False,
+    ))
+    # Duplikat per user digabung ke row yang paling lama (id-nya tetap), field alamat
+    # diisi nilai non-null terbaru seperti upsert dari order, baru duplikatnya dihapus
+    op.execute(
+        """
+        UPDATE customers c
+        SET address = coalesce(m.address, c.address),
+            receiver_name = coalesce(m.receiver_name, c.receiver_name),
+            address_2 = coalesce(m.address_2, c.address_2),
+            suburb = coalesce(m.suburb, c.suburb),
+            state = coalesce(m.state, c.state),
+            phone_number = coalesce(m.phone_number, c.phone_number),
+            post_code = coalesce(m.post_code, c.post_code)
+        FROM (
+            SELECT (array_agg(id ORDER BY created_at, id))[1] AS keep_id,
+                   (array_agg(address ORDER BY created_at DESC, id DESC) FILTER (WHERE address IS NOT NULL))[1] AS address,
+                   (array_agg(receiver_name ORDER BY created_at DESC, id DESC) FILTER (WHERE receiver_name IS NOT NULL))[1] AS receiver_name,
+                   (array_agg(address_2 ORDER BY created_at DESC, id DESC) FILTER (WHERE address_2 IS NOT NULL))[1] AS address_2,
+                   (array_agg(suburb ORDER BY created_at DESC, id DESC) FILTER (WHERE suburb IS NOT NULL))[1] AS suburb,
+                   (array_agg(state ORDER BY created_at DESC, id DESC) FILTER (WHERE state IS NOT NULL))[1] AS state,
+                   (array_agg(phone_number ORDER BY created_at DESC, id DESC) FILTER (WHERE phone_number IS NOT NULL))[1] AS phone_number,
+                   (array_agg(post_code ORDER BY created_at DESC, id DESC) FILTER (WHERE post_code IS NOT NULL))[1] AS post_code
+            FROM customers
+            GROUP BY user_id, name_key
+            HAVING count(*) > 1
+        ) m
+        WHERE c.id = m.keep_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM customers c
+        USING customers d
+        WHERE c.user_id = d.user_id
+          AND c.name_key = d.name_key
+          AND (c.created_at, c.id) > (d.created_at, d.id)
+        """
+    )
+    with op.get_context().autocommit_block():
+        drop_invalid_index('uq_customers_user_id_name_key')
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_customers_user_id_name_key ON customers (user_id, name_key)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_customers_user_id_lower_name")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_customers_user_id_lower_name ON customers (user_id, lower(name))")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_customers_user_id_name_key")
+    op.drop_column('customers', 'name_key')
@@ -0,0 +1,67 @@
+"""add hot path indexes
+
+Revision ID: 792c9780d79c
+Revises: 166deb25ae65
+Create Date: 2026-10-17 09:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '792c9780d79c'
+down_revision: Union[str, Sequence[str], None] = '166deb25ae65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_orders_user_id_created_at_id", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_user_id_created_at_id ON orders (user_id, created_at, id)"),
+    ("ix_products_user_id_created_at_id", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_user_id_created_at_id ON products (user_id, created_at, id)"),
+    ("ix_customers_user_id_created_at_id", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_customers_user_id_created_at_id ON customers (user_id, created_at, id)"),
+    ("ix_order_items_order_id", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_order_items_order_id ON order_items (order_id)"),
+    ("ix_customers_user_id_lower_name", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_customers_user_id_lower_name ON customers (user_id, lower(name))"),
+    ("ix_products_user_id_lower_name", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_user_id_lower_name ON products (user_id, lower(name))"),
+    ("ix_customers_name_trgm", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_customers_name_trgm ON customers USING gin (name gin_trgm_ops)"),
+    ("ix_products_name_trgm", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops)"),
+]
+
+
+def drop_invalid_index(name: str) -> None:
+    """CREATE INDEX CONCURRENTLY yang gagal meninggalkan index INVALID, dan IF NOT EXISTS
+    menganggapnya sudah ada. Index seperti itu di-drop dulu supaya dibuat ulang."""
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_index
+                WHERE indexrelid = to_regclass('{name}') AND NOT indisvalid
+            ) THEN
+                DROP INDEX {name};
+            END IF;
+        END $$
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Default non-volatile sehingga tidak rewrite tabel (PG 11+)
+    op.add_column('customers', sa.Column('created_at', sa.DateTime(), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False))
+
+    # CREATE INDEX CONCURRENTLY tidak boleh jalan di dalam transaksi
+    with op.get_context().autocommit_block():
+        for name, statement in INDEXES:
+            drop_invalid_index(name)
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    op.drop_column('customers', 'created_at')
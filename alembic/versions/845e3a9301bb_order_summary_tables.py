@@ -0,0 +1,79 @@
+"""order summary tables
+
+Revision ID: 845e3a9301bb
+Revises: 64ef9077c010
+Create Date: 2026-10-17 14:52:09.117384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '845e3a9301bb'
+down_revision: Union[str, Sequence[str], None] = '64ef9077c010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('order_daily_stats',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.create_table('product_quantity_stats',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('product_key', sa.String(length=255), nullable=False),
+    sa.Column('product_name', sa.String(length=255), nullable=False),
+    sa.Column('total_qty', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'product_key')
+    )
+    op.create_table('location_stats',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('state', sa.String(), nullable=False),
+    sa.Column('suburb', sa.String(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'state', 'suburb')
+    )
+
+    # Backfill dari data yang sudah ada
+    op.execute(
+        """
+        INSERT INTO order_daily_stats (user_id, day, order_count)
+        SELECT user_id, issues_date::date, count(*)
+        FROM orders
+        GROUP BY user_id, issues_date::date
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO product_quantity_stats (user_id, product_key, product_name, total_qty)
+        SELECT o.user_id, lower(i.product_name), min(i.product_name), sum(i.order_qty)
+        FROM order_items i
+        JOIN orders o ON o.id = i.order_id
+        GROUP BY o.user_id, lower(i.product_name)
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO location_stats (user_id, state, suburb, order_count)
+        SELECT user_id, coalesce(state, ''), coalesce(suburb, ''), count(*)
+        FROM orders
+        GROUP BY user_id, coalesce(state, ''), coalesce(suburb, '')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('location_stats')
+    op.drop_table('product_quantity_stats')
+    op.drop_table('order_daily_stats')
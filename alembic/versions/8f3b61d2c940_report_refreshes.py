@@ -0,0 +1,32 @@
+"""report refreshes
+
+Revision ID: 8f3b61d2c940
+Revises: 5c9e2f7a4d13
+Create Date: 2026-10-17 22:41:09.327514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3b61d2c940'
+down_revision: Union[str, Sequence[str], None] = '5c9e2f7a4d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('report_refreshes',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('report_refreshes')
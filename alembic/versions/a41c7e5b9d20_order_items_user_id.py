@@ -0,0 +1,60 @@
+"""order items user id
+
+Revision ID: a41c7e5b9d20
+Revises: 8f3b61d2c940
+Create Date: 2026-10-18 09:20:41.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c7e5b9d20'
+down_revision: Union[str, Sequence[str], None] = '8f3b61d2c940'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def drop_invalid_index(name: str) -> None:
+    """CREATE INDEX CONCURRENTLY yang gagal meninggalkan index INVALID, dan IF NOT EXISTS
+    menganggapnya sudah ada. Index seperti itu di-drop dulu supaya dibuat ulang."""
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_index
+                WHERE indexrelid = to_regclass('{name}') AND NOT indisvalid
+            ) THEN
+                DROP INDEX {name};
+            END IF;
+        END $$
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('order_items', sa.Column('user_id', sa.UUID(), sa.ForeignKey('users.id'), nullable=True))
+    # Backfill dari orders, jalankan di luar jam sibuk karena menyentuh semua item
+    op.execute("""
+        UPDATE order_items i
+        SET user_id = o.user_id
+        FROM orders o
+        WHERE o.id = i.order_id
+    """)
+    op.alter_column('order_items', 'user_id', nullable=False)
+
+    with op.get_context().autocommit_block():
+        drop_invalid_index('ix_order_items_user_id_search_vector')
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_order_items_user_id_search_vector ON order_items USING gin (user_id, search_vector)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_order_items_search_vector")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_order_items_search_vector ON order_items USING gin (search_vector)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_order_items_user_id_search_vector")
+    op.drop_column('order_items', 'user_id')
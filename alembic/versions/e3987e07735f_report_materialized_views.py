@@ -0,0 +1,77 @@
+"""report materialized views
+
+Revision ID: e3987e07735f
+Revises: 845e3a9301bb
+Create Date: 2026-10-17 16:20:45.581920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3987e07735f'
+down_revision: Union[str, Sequence[str], None] = '845e3a9301bb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_monthly_order_volumes AS
+        SELECT o.user_id,
+               date_trunc('month', o.issues_date)::date AS month,
+               count(DISTINCT o.id) AS order_count,
+               coalesce(sum(i.order_qty), 0) AS total_qty
+        FROM orders o
+        LEFT JOIN order_items i ON i.order_id = o.id
+        GROUP BY o.user_id, date_trunc('month', o.issues_date)::date
+        """
+    )
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_top_products AS
+        SELECT o.user_id,
+               lower(i.product_name) AS product_key,
+               min(i.product_name) AS product_name,
+               sum(i.order_qty) AS total_qty,
+               count(DISTINCT o.id) AS order_count
+        FROM order_items i
+        JOIN orders o ON o.id = i.order_id
+        GROUP BY o.user_id, lower(i.product_name)
+        """
+    )
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_overdue_orders AS
+        SELECT o.id,
+               o.user_id,
+               o.order_id,
+               o.order_reference_number,
+               o.name,
+               o.due_date,
+               count(i.id) AS item_count,
+               coalesce(sum(i.order_qty), 0) AS total_qty
+        FROM orders o
+        LEFT JOIN order_items i ON i.order_id = o.id
+        WHERE o.due_date < (now() AT TIME ZONE 'utc')
+        GROUP BY o.id
+        """
+    )
+    # REFRESH ... CONCURRENTLY butuh unique index di setiap view
+    op.execute("CREATE UNIQUE INDEX uq_mv_monthly_order_volumes ON mv_monthly_order_volumes (user_id, month)")
+    op.execute("CREATE UNIQUE INDEX uq_mv_top_products ON mv_top_products (user_id, product_key)")
+    op.execute("CREATE INDEX ix_mv_top_products_user_id_total_qty ON mv_top_products (user_id, total_qty DESC)")
+    op.execute("CREATE UNIQUE INDEX uq_mv_overdue_orders ON mv_overdue_orders (id)")
+    op.execute("CREATE INDEX ix_mv_overdue_orders_user_id_due_date ON mv_overdue_orders (user_id, due_date)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_overdue_orders")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_top_products")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_monthly_order_volumes")
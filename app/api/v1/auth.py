@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
+from fastapi.security import HTTPAuthorizationCredentials
 
-from app.schemas.auth_schema import AuthLogin, AuthLoginOut, AuthRegister, AuthRegisterOut
-from app.schemas.sys_schema import BaseResponse
+from app.schemas.auth_schema import AuthLogin, AuthLoginOut, AuthLogout, AuthRefresh, AuthRegister, AuthRegisterOut
+from app.schemas.sys_schema import BaseResponse, TokenData
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.auth_service import AuthService
-from app.utils.sys import get_db
+from app.utils.sys import bearer_scheme, get_current_user, get_db
 
 
 router = APIRouter(
@@ -59,4 +60,61 @@ async def register(
                 message=f"Error register : {e}",
                 data=None
             ).model_dump()
-        )
\ No newline at end of file
+        )
+
+@router.post("/refresh", response_model=BaseResponse[AuthLoginOut])
+async def refresh(
+    data: AuthRefresh,
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        service = AuthService(db)
+        result = await service.refresh(data.refreshToken)
+        if not result:
+            return JSONResponse(
+                status_code=401,
+                content=BaseResponse(
+                    status="Error",
+                    message="refresh token tidak valid",
+                    data=None
+                ).model_dump()
+            )
+        return BaseResponse(
+            message="Berhasil refresh token",
+            data=result
+        )
+    except Exception as e:
+        print(f"Error refresh : {e}")
+        return JSONResponse(
+            status_code=500,
+            content=BaseResponse(
+                status="Error",
+                message=f"Error refresh : {e}",
+                data=None
+            ).model_dump()
+        )
+
+@router.post("/logout", response_model=BaseResponse[dict])
+async def logout(
+    data: AuthLogout,
+    creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    user: TokenData = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        service = AuthService(db)
+        result = await service.logout(creds.credentials, data.refreshToken)
+        return BaseResponse(
+            message="Berhasil logout",
+            data=result
+        )
+    except Exception as e:
+        print(f"Error logout : {e}")
+        return JSONResponse(
+            status_code=500,
+            content=BaseResponse(
+                status="Error",
+                message=f"Error logout : {e}",
+                data=None
+            ).model_dump()
+        )
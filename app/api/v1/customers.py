@@ -1,13 +1,18 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import UUID4
 
-from app.schemas.customer_schema import CustomerCreate, CustomerResponse, CustomerUpdate
+from app.schemas.customer_schema import CustomerCreate, CustomerResponse, CustomerSuggestion, CustomerUpdate
 from app.schemas.sys_schema import BaseResponse, TokenData
 from app.services.customer_service import CustomerService
-from app.utils.sys import get_db, get_current_user
+from app.utils.errors import ConflictError
+from app.utils.fields import parse_fields, sparse_model
+from app.utils.http_cache import CachedResponse, cached_response
+from app.utils.pagination import decode_cursor, next_cursor
+from app.utils.responses import JSONBytesResponse, render
+from app.utils.sys import get_current_user, get_read_db, get_write_db
 
 
 router = APIRouter(
@@ -20,18 +25,28 @@ router = APIRouter(
 async def get_customers(
     skip: int = Query(0, ge=0, description="Number of customers to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of customers to return"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor, overrides skip"),
+    fields: Optional[str] = Query(None, description="Comma separated response fields to return, e.g. id,name"),
+    cached: CachedResponse = Depends(cached_response("customers")),
+    db: AsyncSession = Depends(get_read_db),
     user: TokenData = Depends(get_current_user)
 ):
+    if cached.response is not None:
+        return cached.response
+
+    decoded_cursor = decode_cursor(cursor)
+    selected_fields = parse_fields(fields, CustomerResponse)
     try:
         service = CustomerService(db)
-        customers = await service.get_customers(user, skip, limit)
+        customers = await service.get_customers(user, skip, limit, decoded_cursor, selected_fields)
         
-        return BaseResponse(
+        return cached.store(render(
+            BaseResponse[List[sparse_model(CustomerResponse, selected_fields)]],
             status="Success",
             message="Berhasil mengambil data customers",
-            data=[CustomerResponse.model_validate(customer) for customer in customers]
-        )
+            data=customers,
+            next_cursor=next_cursor(customers, limit)
+        ))
         
     except Exception as e:
         print(f"Error get customers: {e}")
@@ -45,24 +60,60 @@ async def get_customers(
         )
 
 
+@router.get("/suggest", response_model=BaseResponse[List[CustomerSuggestion]])
+async def suggest_customers(
+    q: str = Query(..., min_length=1, description="Prefix nama customer"),
+    limit: int = Query(10, ge=1, le=50, description="Number of suggestions to return"),
+    db: AsyncSession = Depends(get_read_db),
+    user: TokenData = Depends(get_current_user)
+):
+    try:
+        service = CustomerService(db)
+        suggestions = await service.suggest_customers(user, q, limit)
+
+        return BaseResponse(
+            status="Success",
+            message="Berhasil mengambil saran customers",
+            data=[CustomerSuggestion(**suggestion) for suggestion in suggestions]
+        )
+
+    except Exception as e:
+        print(f"Error suggest customers: {e}")
+        return JSONResponse(
+            status_code=500,
+            content=BaseResponse(
+                status="Error",
+                message=f"Error suggest customers: {e}",
+                data=None
+            ).model_dump()
+        )
+
+
 @router.get("/{customer_id}", response_model=BaseResponse[CustomerResponse])
 async def get_customer_by_id(
     customer_id: UUID4,
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Comma separated response fields to return, e.g. id,name"),
+    cached: CachedResponse = Depends(cached_response("customers")),
+    db: AsyncSession = Depends(get_read_db),
     user: TokenData = Depends(get_current_user)
 ):
+    if cached.response is not None:
+        return cached.response
+
+    selected_fields = parse_fields(fields, CustomerResponse)
     try:
         service = CustomerService(db)
-        customer = await service.get_customer_by_id(customer_id, user)
+        customer = await service.get_customer_by_id(customer_id, user, selected_fields)
         
         if not customer:
             raise HTTPException(status_code=404, detail="Customer not found")
         
-        return BaseResponse(
+        return cached.store(render(
+            BaseResponse[sparse_model(CustomerResponse, selected_fields)],
             status="Success",
             message="Berhasil mengambil data customer",
-            data=CustomerResponse.model_validate(customer)
-        )
+            data=customer
+        ))
         
     except HTTPException:
         raise
@@ -81,19 +132,29 @@ async def get_customer_by_id(
 @router.post("/", response_model=BaseResponse[CustomerResponse])
 async def create_customer(
     customer_data: CustomerCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user: TokenData = Depends(get_current_user)
 ):
     try:
         service = CustomerService(db)
         result = await service.create_customer(customer_data, user)
         
-        return BaseResponse(
+        return JSONBytesResponse(render(
+            BaseResponse[CustomerResponse],
             status="Success",
             message="Customer created successfully",
-            data=CustomerResponse.model_validate(result)
-        )
+            data=result
+        ))
         
+    except ConflictError as e:
+        return JSONResponse(
+            status_code=409,
+            content=BaseResponse(
+                status="Error",
+                message=str(e),
+                data=None
+            ).model_dump()
+        )
     except Exception as e:
         print(f"Error create customer: {e}")
         return JSONResponse(
@@ -110,7 +171,7 @@ async def create_customer(
 async def update_customer(
     customer_id: UUID4,
     customer_data: CustomerUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user: TokenData = Depends(get_current_user)
 ):
     try:
@@ -120,14 +181,24 @@ async def update_customer(
         if not updated_customer:
             raise HTTPException(status_code=404, detail="Customer not found")
         
-        return BaseResponse(
+        return JSONBytesResponse(render(
+            BaseResponse[CustomerResponse],
             status="Success",
             message="Customer updated successfully",
-            data=CustomerResponse.model_validate(updated_customer)
-        )
+            data=updated_customer
+        ))
         
     except HTTPException:
         raise
+    except ConflictError as e:
+        return JSONResponse(
+            status_code=409,
+            content=BaseResponse(
+                status="Error",
+                message=str(e),
+                data=None
+            ).model_dump()
+        )
     except Exception as e:
         print(f"Error update customer: {e}")
         return JSONResponse(
@@ -143,7 +214,7 @@ async def update_customer(
 @router.delete("/{customer_id}", response_model=BaseResponse[dict])
 async def delete_customer(
     customer_id: UUID4,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user: TokenData = Depends(get_current_user)
 ):
     try:
@@ -1,13 +1,23 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import JSONResponse
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import UUID4
+from starlette.background import BackgroundTask
 
+from app.core.database import read_session_for
 from app.schemas.order_schema import OrderCreate, OrderResponse, OrderUpdate, OrderWithItemsResponse
 from app.schemas.sys_schema import BaseResponse, TokenData
+from app.services.order_export_service import OrderExportService, encode_csv, encode_ndjson
+from app.services.order_import_service import OrderImportService
 from app.services.order_service import OrderService
-from app.utils.sys import get_db, get_current_user
+from app.utils.dates import naive_utc
+from app.utils.fields import parse_fields, sparse_model
+from app.utils.http_cache import CachedResponse, cached_response
+from app.utils.pagination import decode_cursor, next_cursor
+from app.utils.responses import JSONBytesResponse, render
+from app.utils.sys import get_current_user, get_read_db, get_write_db, reads_primary
 
 
 router = APIRouter(
@@ -20,18 +30,28 @@ router = APIRouter(
 async def get_orders(
     skip: int = Query(0, ge=0, description="Number of orders to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of orders to return"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor, overrides skip"),
+    fields: Optional[str] = Query(None, description="Comma separated response fields to return, e.g. id,name"),
+    cached: CachedResponse = Depends(cached_response("orders")),
+    db: AsyncSession = Depends(get_read_db),
     user: TokenData = Depends(get_current_user)
 ):
+    if cached.response is not None:
+        return cached.response
+
+    decoded_cursor = decode_cursor(cursor)
+    selected_fields = parse_fields(fields, OrderWithItemsResponse)
     try:
         service = OrderService(db)
-        orders = await service.get_orders(user, skip, limit)
+        orders = await service.get_orders(user, skip, limit, decoded_cursor, selected_fields)
         
-        return BaseResponse(
+        return cached.store(render(
+            BaseResponse[List[sparse_model(OrderWithItemsResponse, selected_fields)]],
             status="Success",
             message="Berhasil mengambil data orders",
-            data=[OrderWithItemsResponse.model_validate(order) for order in orders]
-        )
+            data=orders,
+            next_cursor=next_cursor(orders, limit)
+        ))
         
     except Exception as e:
         print(f"Error get orders: {e}")
@@ -45,24 +65,75 @@ async def get_orders(
         )
 
 
+@router.get("/export")
+async def export_orders(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="Export format"),
+    date_from: Optional[datetime] = Query(None, description="Include orders created at or after this time"),
+    date_to: Optional[datetime] = Query(None, description="Include orders created before this time"),
+    user: TokenData = Depends(get_current_user)
+):
+    if date_from and date_to and naive_utc(date_from) >= naive_utc(date_to):
+        return JSONResponse(
+            status_code=400,
+            content=BaseResponse(
+                status="Error",
+                message="date_from harus sebelum date_to",
+                data=None
+            ).model_dump()
+        )
+
+    encode = encode_csv if format == "csv" else encode_ndjson
+    # Session ditutup oleh background task karena harus hidup selama response di-stream
+    session = read_session_for(user.user_id, reads_primary(request))()
+    try:
+        rows = await OrderExportService(session).stream_rows(user, date_from, date_to)
+    except Exception as e:
+        await session.close()
+        print(f"Error export orders: {e}")
+        return JSONResponse(
+            status_code=500,
+            content=BaseResponse(
+                status="Error",
+                message=f"Error export orders: {e}",
+                data=None
+            ).model_dump()
+        )
+
+    filename = f"orders-{datetime.utcnow():%Y%m%d%H%M%S}.{format}"
+    return StreamingResponse(
+        encode(rows),
+        media_type="text/csv" if format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        background=BackgroundTask(session.close)
+    )
+
+
 @router.get("/{order_id}", response_model=BaseResponse[OrderWithItemsResponse])
 async def get_order_by_id(
     order_id: UUID4,
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Comma separated response fields to return, e.g. id,name"),
+    cached: CachedResponse = Depends(cached_response("orders")),
+    db: AsyncSession = Depends(get_read_db),
     user: TokenData = Depends(get_current_user)
 ):
+    if cached.response is not None:
+        return cached.response
+
+    selected_fields = parse_fields(fields, OrderWithItemsResponse)
     try:
         service = OrderService(db)
-        order = await service.get_order_by_id(order_id, user)
+        order = await service.get_order_by_id(order_id, user, selected_fields)
         
         if not order:
             raise HTTPException(status_code=404, detail="Order not found")
         
-        return BaseResponse(
+        return cached.store(render(
+            BaseResponse[sparse_model(OrderWithItemsResponse, selected_fields)],
             status="Success",
             message="Berhasil mengambil data order",
-            data=OrderWithItemsResponse.model_validate(order)
-        )
+            data=order
+        ))
         
     except HTTPException:
         raise
@@ -81,18 +152,19 @@ async def get_order_by_id(
 @router.post("/", response_model=BaseResponse[OrderWithItemsResponse])
 async def create_order(
     order_data: OrderCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user: TokenData = Depends(get_current_user)
 ):
     try:
         service = OrderService(db)
         result = await service.create_order(order_data, user)
         
-        return BaseResponse(
+        return JSONBytesResponse(render(
+            BaseResponse[OrderWithItemsResponse],
             status="Success",
             message="Order created successfully",
-            data=OrderWithItemsResponse.model_validate(result)
-        )
+            data=result
+        ))
         
     except ValueError as ve:
         return JSONResponse(
@@ -115,11 +187,42 @@ async def create_order(
         )
 
 
+@router.post("/import", response_model=BaseResponse[dict])
+async def import_orders(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="csv or ndjson, defaults to the request content type"),
+    db: AsyncSession = Depends(get_write_db),
+    user: TokenData = Depends(get_current_user)
+):
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    try:
+        service = OrderImportService(db)
+        report = await service.import_stream(request.stream(), format, user)
+        
+        return BaseResponse(
+            status="Success",
+            message=f"Import selesai: {report['imported']} berhasil, {report['failed']} gagal",
+            data=report
+        )
+        
+    except Exception as e:
+        print(f"Error import orders: {e}")
+        return JSONResponse(
+            status_code=500,
+            content=BaseResponse(
+                status="Error",
+                message=f"Error import orders: {e}",
+                data=None
+            ).model_dump()
+        )
+
+
 @router.put("/{order_id}", response_model=BaseResponse[OrderWithItemsResponse])
 async def update_order(
     order_id: UUID4,
     order_data: OrderUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user: TokenData = Depends(get_current_user)
 ):
     try:
@@ -129,11 +232,12 @@ async def update_order(
         if not updated_order:
             raise HTTPException(status_code=404, detail="Order not found")
         
-        return BaseResponse(
+        return JSONBytesResponse(render(
+            BaseResponse[OrderWithItemsResponse],
             status="Success",
             message="Order updated successfully",
-            data=OrderWithItemsResponse.model_validate(updated_order)
-        )
+            data=updated_order
+        ))
         
     except HTTPException:
         raise
@@ -161,7 +265,7 @@ async def update_order(
 @router.delete("/{order_id}", response_model=BaseResponse[dict])
 async def delete_order(
     order_id: UUID4,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user: TokenData = Depends(get_current_user)
 ):
     try:
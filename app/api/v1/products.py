@@ -1,13 +1,18 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import UUID4
 
-from app.schemas.product_schema import ProductCreate, ProductResponse, ProductUpdate
+from app.schemas.product_schema import ProductCreate, ProductResponse, ProductSuggestion, ProductUpdate
 from app.schemas.sys_schema import BaseResponse, TokenData
 from app.services.product_service import ProductService
-from app.utils.sys import get_db, get_current_user
+from app.utils.errors import ConflictError
+from app.utils.fields import parse_fields, sparse_model
+from app.utils.http_cache import CachedResponse, cached_response
+from app.utils.pagination import decode_cursor, next_cursor
+from app.utils.responses import JSONBytesResponse, render
+from app.utils.sys import get_current_user, get_read_db, get_write_db
 
 
 router = APIRouter(
@@ -20,18 +25,28 @@ router = APIRouter(
 async def get_products(
     skip: int = Query(0, ge=0, description="Number of products to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of products to return"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor, overrides skip"),
+    fields: Optional[str] = Query(None, description="Comma separated response fields to return, e.g. id,name"),
+    cached: CachedResponse = Depends(cached_response("products")),
+    db: AsyncSession = Depends(get_read_db),
     user: TokenData = Depends(get_current_user)
 ):
+    if cached.response is not None:
+        return cached.response
+
+    decoded_cursor = decode_cursor(cursor)
+    selected_fields = parse_fields(fields, ProductResponse)
     try:
         service = ProductService(db)
-        products = await service.get_products(user, skip, limit)
+        products = await service.get_products(user, skip, limit, decoded_cursor, selected_fields)
         
-        return BaseResponse(
+        return cached.store(render(
+            BaseResponse[List[sparse_model(ProductResponse, selected_fields)]],
             status="Success",
             message="Berhasil mengambil data products",
-            data=[ProductResponse.model_validate(product) for product in products]
-        )
+            data=products,
+            next_cursor=next_cursor(products, limit)
+        ))
         
     except Exception as e:
         print(f"Error get products: {e}")
@@ -45,24 +60,60 @@ async def get_products(
         )
 
 
+@router.get("/suggest", response_model=BaseResponse[List[ProductSuggestion]])
+async def suggest_products(
+    q: str = Query(..., min_length=1, description="Prefix nama product"),
+    limit: int = Query(10, ge=1, le=50, description="Number of suggestions to return"),
+    db: AsyncSession = Depends(get_read_db),
+    user: TokenData = Depends(get_current_user)
+):
+    try:
+        service = ProductService(db)
+        suggestions = await service.suggest_products(user, q, limit)
+
+        return BaseResponse(
+            status="Success",
+            message="Berhasil mengambil saran products",
+            data=[ProductSuggestion(**suggestion) for suggestion in suggestions]
+        )
+
+    except Exception as e:
+        print(f"Error suggest products: {e}")
+        return JSONResponse(
+            status_code=500,
+            content=BaseResponse(
+                status="Error",
+                message=f"Error suggest products: {e}",
+                data=None
+            ).model_dump()
+        )
+
+
 @router.get("/{product_id}", response_model=BaseResponse[ProductResponse])
 async def get_product_by_id(
     product_id: UUID4,
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Comma separated response fields to return, e.g. id,name"),
+    cached: CachedResponse = Depends(cached_response("products")),
+    db: AsyncSession = Depends(get_read_db),
     user: TokenData = Depends(get_current_user)
 ):
+    if cached.response is not None:
+        return cached.response
+
+    selected_fields = parse_fields(fields, ProductResponse)
     try:
         service = ProductService(db)
-        product = await service.get_product_by_id(product_id, user)
+        product = await service.get_product_by_id(product_id, user, selected_fields)
         
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
         
-        return BaseResponse(
+        return cached.store(render(
+            BaseResponse[sparse_model(ProductResponse, selected_fields)],
             status="Success",
             message="Berhasil mengambil data product",
-            data=ProductResponse.model_validate(product)
-        )
+            data=product
+        ))
         
     except HTTPException:
         raise
@@ -81,19 +132,29 @@ async def get_product_by_id(
 @router.post("/", response_model=BaseResponse[ProductResponse])
 async def create_product(
     product_data: ProductCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user: TokenData = Depends(get_current_user)
 ):
     try:
         service = ProductService(db)
         result = await service.create_product(product_data, user)
         
-        return BaseResponse(
+        return JSONBytesResponse(render(
+            BaseResponse[ProductResponse],
             status="Success",
             message="Product created successfully",
-            data=ProductResponse.model_validate(result)
-        )
+            data=result
+        ))
         
+    except ConflictError as e:
+        return JSONResponse(
+            status_code=409,
+            content=BaseResponse(
+                status="Error",
+                message=str(e),
+                data=None
+            ).model_dump()
+        )
     except Exception as e:
         print(f"Error create product: {e}")
         return JSONResponse(
@@ -110,7 +171,7 @@ async def create_product(
 async def update_product(
     product_id: UUID4,
     product_data: ProductUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user: TokenData = Depends(get_current_user)
 ):
     try:
@@ -120,14 +181,24 @@ async def update_product(
         if not updated_product:
             raise HTTPException(status_code=404, detail="Product not found")
         
-        return BaseResponse(
+        return JSONBytesResponse(render(
+            BaseResponse[ProductResponse],
             status="Success",
             message="Product updated successfully",
-            data=ProductResponse.model_validate(updated_product)
-        )
+            data=updated_product
+        ))
         
     except HTTPException:
         raise
+    except ConflictError as e:
+        return JSONResponse(
+            status_code=409,
+            content=BaseResponse(
+                status="Error",
+                message=str(e),
+                data=None
+            ).model_dump()
+        )
     except Exception as e:
         print(f"Error update product: {e}")
         return JSONResponse(
@@ -143,7 +214,7 @@ async def update_product(
 @router.delete("/{product_id}", response_model=BaseResponse[dict])
 async def delete_product(
     product_id: UUID4,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user: TokenData = Depends(get_current_user)
 ):
     try:
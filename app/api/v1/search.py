@@ -0,0 +1,49 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.search_schema import SearchHit
+from app.schemas.sys_schema import BaseResponse, TokenData
+from app.services.search_service import SEARCH_TYPES, SearchService
+from app.utils.pagination import decode_rank_cursor, next_rank_cursor
+from app.utils.sys import get_current_user, get_read_db
+
+
+router = APIRouter(
+    prefix="/search",
+    tags=["Search"]
+)
+
+
+@router.get("/", response_model=BaseResponse[List[SearchHit]])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text, supports quotes, OR and -exclude"),
+    type: Optional[str] = Query(None, pattern="^(order|customer|product)$", description="Only search one resource type"),
+    limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor"),
+    db: AsyncSession = Depends(get_read_db),
+    user: TokenData = Depends(get_current_user)
+):
+    decoded_cursor = decode_rank_cursor(cursor)
+    try:
+        service = SearchService(db)
+        hits = await service.search(user, q, (type,) if type else SEARCH_TYPES, limit, decoded_cursor)
+        
+        return BaseResponse(
+            status="Success",
+            message="Berhasil mencari data",
+            data=[SearchHit.model_validate(hit) for hit in hits],
+            next_cursor=next_rank_cursor(hits, limit)
+        )
+        
+    except Exception as e:
+        print(f"Error search: {e}")
+        return JSONResponse(
+            status_code=500,
+            content=BaseResponse(
+                status="Error",
+                message=f"Error search: {e}",
+                data=None
+            ).model_dump()
+        )
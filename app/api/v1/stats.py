@@ -0,0 +1,128 @@
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.stats_schema import MonthlyVolume, OverdueOrder, StatsResponse, TopProduct
+from app.schemas.sys_schema import BaseResponse, TokenData
+from app.services.report_service import ReportService
+from app.services.stats_service import StatsService
+from app.utils.sys import get_current_user, get_read_db
+
+
+router = APIRouter(
+    prefix="/stats",
+    tags=["Stats"]
+)
+
+
+@router.get("/", response_model=BaseResponse[StatsResponse])
+async def get_stats(
+    date_from: Optional[date] = Query(None, description="First day of orders_per_day"),
+    date_to: Optional[date] = Query(None, description="Last day of orders_per_day"),
+    db: AsyncSession = Depends(get_read_db),
+    user: TokenData = Depends(get_current_user)
+):
+    try:
+        service = StatsService(db)
+        stats = await service.get_stats(user, date_from, date_to)
+        
+        return BaseResponse(
+            status="Success",
+            message="Berhasil mengambil data stats",
+            data=StatsResponse.model_validate(stats)
+        )
+        
+    except Exception as e:
+        print(f"Error get stats: {e}")
+        return JSONResponse(
+            status_code=500,
+            content=BaseResponse(
+                status="Error",
+                message=f"Error get stats: {e}",
+                data=None
+            ).model_dump()
+        )
+
+
+@router.get("/monthly", response_model=BaseResponse[List[MonthlyVolume]])
+async def get_monthly_volumes(
+    db: AsyncSession = Depends(get_read_db),
+    user: TokenData = Depends(get_current_user)
+):
+    try:
+        service = ReportService(db)
+        rows = await service.get_monthly_volumes(user)
+        
+        return BaseResponse(
+            status="Success",
+            message="Berhasil mengambil data monthly volumes",
+            data=[MonthlyVolume.model_validate(row) for row in rows]
+        )
+        
+    except Exception as e:
+        print(f"Error get monthly volumes: {e}")
+        return JSONResponse(
+            status_code=500,
+            content=BaseResponse(
+                status="Error",
+                message=f"Error get monthly volumes: {e}",
+                data=None
+            ).model_dump()
+        )
+
+@router.get("/top-products", response_model=BaseResponse[List[TopProduct]])
+async def get_top_products(
+    limit: int = Query(20, ge=1, le=100, description="Number of products to return"),
+    db: AsyncSession = Depends(get_read_db),
+    user: TokenData = Depends(get_current_user)
+):
+    try:
+        service = ReportService(db)
+        rows = await service.get_top_products(user, limit)
+        
+        return BaseResponse(
+            status="Success",
+            message="Berhasil mengambil data top products",
+            data=[TopProduct.model_validate(row) for row in rows]
+        )
+        
+    except Exception as e:
+        print(f"Error get top products: {e}")
+        return JSONResponse(
+            status_code=500,
+            content=BaseResponse(
+                status="Error",
+                message=f"Error get top products: {e}",
+                data=None
+            ).model_dump()
+        )
+
+@router.get("/overdue", response_model=BaseResponse[List[OverdueOrder]])
+async def get_overdue_orders(
+    skip: int = Query(0, ge=0, description="Number of orders to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of orders to return"),
+    db: AsyncSession = Depends(get_read_db),
+    user: TokenData = Depends(get_current_user)
+):
+    try:
+        service = ReportService(db)
+        rows = await service.get_overdue_orders(user, skip, limit)
+        
+        return BaseResponse(
+            status="Success",
+            message="Berhasil mengambil data overdue orders",
+            data=[OverdueOrder.model_validate(row) for row in rows]
+        )
+        
+    except Exception as e:
+        print(f"Error get overdue orders: {e}")
+        return JSONResponse(
+            status_code=500,
+            content=BaseResponse(
+                status="Error",
+                message=f"Error get overdue orders: {e}",
+                data=None
+            ).model_dump()
+        )
\ No newline at end of file
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends
+
+from app.core.database import get_pool_stats
+from app.schemas.sys_schema import BaseResponse, TokenData
+from app.utils.response_cache import response_cache
+from app.utils.sys import get_current_admin, get_current_user
+
+
+router = APIRouter(
+    prefix="/system",
+    tags=["System"]
+)
+
+
+@router.get("/pool", response_model=BaseResponse[dict])
+async def pool_stats(
+    user: TokenData = Depends(get_current_admin)
+):
+    return BaseResponse(
+        message="Berhasil mengambil statistik pool database",
+        data=get_pool_stats()
+    )
+
+
+@router.get("/cache", response_model=BaseResponse[dict])
+async def cache_stats(
+    user: TokenData = Depends(get_current_user)
+):
+    return BaseResponse(
+        message="Berhasil mengambil statistik response cache",
+        data=response_cache.backend.stats()
+    )
@@ -1,9 +1,9 @@
-import shutil
-import os
-from uuid import uuid4
-from fastapi import APIRouter, Depends, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.sys_schema import BaseResponse, TokenData
-from app.utils.sys import get_current_user
+from app.services.upload_service import UploadService
+from app.utils.sys import get_current_user, get_write_db
 
 router = APIRouter(
     prefix="/upload",
@@ -13,19 +13,23 @@ router = APIRouter(
 @router.post("/")
 async def upload_file(
     file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_write_db),
     user: TokenData = Depends(get_current_user)
 ):
-    upload_dir = f"uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-
-    file_extension = file.filename.split(".")[-1]
-    unique_filename = f"{uuid4()}.{file_extension}"
-    file_path = os.path.join(upload_dir, unique_filename)
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    try:
+        result = await UploadService(db).save(file, user)
+    except HTTPException as e:
+        # File di atas UPLOAD_MAX_BYTES, format sama dengan 413 dari BodySizeLimitMiddleware
+        return JSONResponse(
+            status_code=e.status_code,
+            content=BaseResponse(
+                status="Error",
+                message=e.detail,
+                data=None
+            ).model_dump()
+        )
 
     return BaseResponse(
         message="File uploaded successfully",
-        data={ "url": file_path }
-    )
\ No newline at end of file
+        data=result
+    )
@@ -0,0 +1,202 @@
+import gzip
+import zlib
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli opsional, tanpa paket ini hanya gzip yang ditawarkan
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/",
+)
+
+
+def negotiate(accept_encoding: str, available: Iterable[str]) -> Optional[str]:
+    """Pilih encoding dengan q tertinggi dari Accept-Encoding, urutan available sebagai tie-break"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """Kompresor streaming dengan interface yang sama untuk gzip dan brotli"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        # Flush setiap chunk supaya client menerima data tanpa menunggu buffer kompresor penuh
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish() if self.encoding == "br" else self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """Kompresi gzip/brotli sesuai Accept-Encoding.
+
+    Body yang punya ETag (response dari cache) disimpan dalam bentuk terkompresi di LRU
+    kecil, sehingga polling berulang tidak mengompres ulang body yang sama.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        exclude_paths: Tuple[str, ...] = (),
+        cache_entries: int = 256,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.exclude_paths = exclude_paths
+        self.cache_entries = cache_entries
+        self.encodings = ("br", "gzip") if brotli else ("gzip",)
+        self._compressed: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self, encoding, scope["path"], send).run(self.app, scope, receive)
+
+    def compress(self, encoding: str, body: bytes, path: str = "", etag: Optional[str] = None) -> bytes:
+        """Kompres body utuh, hasilnya disimpan per (encoding, path, ETag) kalau response punya ETag.
+
+        ETag dari cached_response sudah unik per user, route dan versi resource, jadi tidak
+        perlu meng-hash body untuk key cache. Path ikut di key untuk ETag dari sumber lain.
+        """
+        key = (encoding, path, etag)
+        if etag is not None and key in self._compressed:
+            self._compressed.move_to_end(key)
+            return self._compressed[key]
+
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+        if etag is not None and self.cache_entries:
+            self._compressed[key] = compressed
+            while len(self._compressed) > self.cache_entries:
+                self._compressed.popitem(last=False)
+        return compressed
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, path: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.path = path
+        self.send = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def run(self, app: ASGIApp, scope: Scope, receive: Receive) -> None:
+        await app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if not self.passthrough or message["status"] == 304:
+                # Vary dikirim walaupun body akhirnya terlalu kecil untuk dikompres, dan di 304
+                # supaya sama dengan response 200 yang divalidasinya
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self._send_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None and not more_body:
+            # Body utuh dalam satu message
+            if len(body) < self.middleware.minimum_size:
+                await self._send_start()
+                await self.send(message)
+                return
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            body = self.middleware.compress(self.encoding, body, self.path, headers.get("etag"))
+            self._set_encoding_headers(headers)
+            headers["Content-Length"] = str(len(body))
+            await self._send_start()
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        if self.compressor is None:
+            # Streaming: panjang total tidak diketahui, kompres per chunk
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            self._set_encoding_headers(headers)
+            del headers["Content-Length"]
+            self.compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            await self._send_start()
+
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and etag.endswith('"'):
+            # Representasi terkompresi butuh strong ETag sendiri
+            headers["ETag"] = f'{etag[:-1]}-{self.encoding}"'
+
+    async def _send_start(self) -> None:
+        if self.start_message is not None:
+            await self.send(self.start_message)
+            self.start_message = None
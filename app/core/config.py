@@ -2,4 +2,79 @@ import os
 
 class Settings:
     DEBUG = True
+
+    # Database connection pool (per worker process)
+    DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # asyncpg prepared statement caches, set both to 0 behind pgbouncer (transaction mode)
+    DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "100"))
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+    # Setelah write, read user tersebut dipin ke primary selama N detik (lewat token
+    # cookie/header X-Read-Your-Writes, berlaku di semua worker)
+    DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+    # > 1 mengaktifkan reservasi order_id per block di setiap worker
+    ORDER_ID_BLOCK_SIZE = int(os.getenv("ORDER_ID_BLOCK_SIZE", "1"))
+
+    # Jumlah order per batch (COPY + commit) di endpoint import
+    ORDER_IMPORT_BATCH_SIZE = int(os.getenv("ORDER_IMPORT_BATCH_SIZE", "500"))
+
+    # Refresh materialized view laporan lewat APScheduler. Hanya job ini yang dimatikan,
+    # sync revocation tetap jalan di setiap worker karena bloom filter-nya per proses
+    REPORT_REFRESH_ENABLED = os.getenv("REPORT_REFRESH_ENABLED", "true").lower() == "true"
+    REPORT_REFRESH_INTERVAL_SECONDS = int(os.getenv("REPORT_REFRESH_INTERVAL_SECONDS", "300"))
+    REPORT_REFRESH_JITTER_SECONDS = int(os.getenv("REPORT_REFRESH_JITTER_SECONDS", "30"))
+
+    # Index autocomplete customer/product per user di memory
+    AUTOCOMPLETE_MAX_USERS = int(os.getenv("AUTOCOMPLETE_MAX_USERS", "500"))
+    AUTOCOMPLETE_TTL_SECONDS = float(os.getenv("AUTOCOMPLETE_TTL_SECONDS", "300"))
+
+    # Cache response GET per user, backend "memory" atau "none"
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30"))
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", str(4 * 1024 * 1024)))
+
+    # bcrypt dijalankan di thread pool terpisah, ubah ROUNDS untuk menaikkan/menurunkan cost
+    PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+
+    # Secret untuk tanda tangan JWT dan nama file upload yang tidak bisa ditebak
+    SECRET_KEY = os.getenv("SECRET_KEY", "temp_dashboard_rest_cuiiiii!!!!!!!!")
+
+    # Access token pendek + refresh token, token yang dicabut dicek lewat Bloom filter per worker
+    ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+    REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+    REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+    REVOCATION_BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+    REVOCATION_SYNC_SECONDS = int(os.getenv("REVOCATION_SYNC_SECONDS", "10"))
+    REVOCATION_REBUILD_SECONDS = int(os.getenv("REVOCATION_REBUILD_SECONDS", "3600"))
+
+    # Jumlah JWT terverifikasi yang disimpan per worker, 0 untuk menonaktifkan
+    TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+    # Batas ukuran upload, request di UPLOAD_PATHS ditolak 413 sebelum body dibaca
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(256 * 1024 * 1024)))
+    UPLOAD_PATHS = tuple(path for path in os.getenv("UPLOAD_PATHS", "/api/v1/upload").split(",") if path)
+
+    # GC object upload tanpa referensi, grace period memberi waktu file dipakai di order
+    UPLOAD_GC_INTERVAL_SECONDS = int(os.getenv("UPLOAD_GC_INTERVAL_SECONDS", "3600"))
+    UPLOAD_GC_GRACE_SECONDS = int(os.getenv("UPLOAD_GC_GRACE_SECONDS", str(24 * 3600)))
+    UPLOAD_GC_BATCH_SIZE = int(os.getenv("UPLOAD_GC_BATCH_SIZE", "1000"))
+
+    # Kompresi response gzip/brotli, path di COMPRESSION_EXCLUDE_PATHS dikirim apa adanya
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_CACHE_ENTRIES = int(os.getenv("COMPRESSION_CACHE_ENTRIES", "256"))
+    COMPRESSION_EXCLUDE_PATHS = tuple(
+        path for path in os.getenv("COMPRESSION_EXCLUDE_PATHS", "/api/v1/orders/export,/uploads").split(",") if path
+    )
 settings = Settings()
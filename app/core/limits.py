@@ -0,0 +1,61 @@
+from typing import Tuple
+
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    """Tolak body yang lebih besar dari max_size di path tertentu.
+
+    Content-Length yang terlalu besar langsung dijawab 413 tanpa membaca body. Body tanpa
+    Content-Length (chunked) dihitung saat dibaca dan dihentikan begitu melewati batas.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int, paths: Tuple[str, ...]):
+        self.app = app
+        self.max_size = max_size
+        self.paths = paths
+
+    def _too_large(self) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"status": "Error", "message": f"Ukuran body melebihi batas {self.max_size} bytes", "data": None},
+            headers={"Connection": "close"},
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_size:
+            await self._too_large()(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    exceeded = True
+                    # FastAPI mengubah exception lain saat parsing body menjadi 400, jadi
+                    # HTTPException dipakai untuk menghentikan handler
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            return message
+
+        async def limited_send(message: Message) -> None:
+            if not exceeded:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                # Response {"detail"} dari FastAPI diganti format BaseResponse yang sama
+                # dengan penolakan lewat Content-Length
+                await self._too_large()(scope, receive, send)
+
+        await self.app(scope, limited_receive, limited_send)
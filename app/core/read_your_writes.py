@@ -0,0 +1,72 @@
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+COOKIE_NAME = "read_primary_until"
+HEADER_NAME = "x-read-your-writes"
+
+# Key di scope["state"]: diisi middleware dari token request / diisi hook commit
+READ_PRIMARY = "read_primary"
+WROTE_PRIMARY = "wrote_primary"
+
+
+def _signature(until: int) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), f"read-primary:{until}".encode(), hashlib.sha256).hexdigest()
+
+
+def sign_until(until: int) -> str:
+    return f"{until}.{_signature(until)}"
+
+
+def is_pinned(token: Optional[str], now: float) -> bool:
+    """Token valid dan belum lewat, token rusak atau palsu dianggap tidak ada"""
+    if not token or "." not in token:
+        return False
+    until, signature = token.split(".", 1)
+    if not until.isdigit() or not hmac.compare_digest(signature, _signature(int(until))):
+        return False
+    return now < int(until)
+
+
+class ReadYourWritesMiddleware:
+    """Pin read ke primary setelah write, berlaku di semua worker.
+
+    Setelah commit di session write, response membawa token bertanda tangan berisi batas
+    waktu pin (cookie dan header X-Read-Your-Writes). Request berikutnya yang membawa
+    token tersebut (cookie atau header yang sama) dibaca dari primary, worker mana pun
+    yang menerimanya.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        token = headers.get(HEADER_NAME) or cookie_parser(headers.get("cookie", "")).get(COOKIE_NAME)
+        state = scope.setdefault("state", {})
+        state[READ_PRIMARY] = is_pinned(token, time.time())
+
+        async def pin_send(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.get(WROTE_PRIMARY):
+                max_age = int(self.window_seconds) + 1
+                token = sign_until(int(time.time()) + max_age)
+                response_headers = MutableHeaders(scope=message)
+                response_headers.append(
+                    "set-cookie", f"{COOKIE_NAME}={token}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                response_headers.append(HEADER_NAME, token)
+            await send(message)
+
+        await self.app(scope, receive, pin_send)
@@ -1,10 +1,23 @@
 from fastapi.staticfiles import StaticFiles
 import uvicorn
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from app.api.v1 import auth, upload, products, customers, orders
+from app.api.v1 import auth, upload, products, customers, orders, search, stats, system
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.database import replica_engine
+from app.core.limits import BodySizeLimitMiddleware
+from app.core.read_your_writes import ReadYourWritesMiddleware
+from app.core.scheduler import scheduler
+from app.schemas.sys_schema import BaseResponse
+from app.services.report_service import refresh_report_views
+from app.services.token_service import sync_revocations
+from app.services.upload_service import collect_unreferenced_uploads
+from app.utils.errors import BadRequestError
+from app.utils.passwords import password_executor
 from app.utils.sys import get_db
 from app import models
 
@@ -13,13 +26,58 @@ async def lifespan(app: FastAPI):
     # Actions on startup
     print("API starting up...")
     
-    # Schedule the job to run every minute
-    # You might want to adjust the interval based on your needs
-    # deposito_service = DepositoService(None) # db will be passed in check_due_depositos
-    # scheduler.add_job(deposito_service.check_due_depositos, 'interval', minutes=1, args=[get_db])
+    # Bloom filter revocation diisi sebelum request pertama dilayani
+    await sync_revocations(full=True)
+    scheduler.add_job(
+        sync_revocations,
+        "interval",
+        seconds=settings.REVOCATION_SYNC_SECONDS,
+        id="sync_revocations",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        sync_revocations,
+        "interval",
+        kwargs={"full": True},
+        seconds=settings.REVOCATION_REBUILD_SECONDS,
+        id="rebuild_revocations",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+    )
+
+    if settings.UPLOAD_GC_INTERVAL_SECONDS > 0:
+        scheduler.add_job(
+            collect_unreferenced_uploads,
+            "interval",
+            seconds=settings.UPLOAD_GC_INTERVAL_SECONDS,
+            id="collect_unreferenced_uploads",
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True,
+        )
+
+    if settings.REPORT_REFRESH_ENABLED:
+        # Jitter supaya worker tidak berebut lock di detik yang sama
+        scheduler.add_job(
+            refresh_report_views,
+            "interval",
+            seconds=settings.REPORT_REFRESH_INTERVAL_SECONDS,
+            jitter=settings.REPORT_REFRESH_JITTER_SECONDS,
+            id="refresh_report_views",
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True,
+        )
+    scheduler.start()
 
     yield
     # Actions on shutdown
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    password_executor.shutdown(wait=False)
     print("API shutting down...")
 
 app = FastAPI(
@@ -28,6 +86,13 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+@app.exception_handler(BadRequestError)
+async def bad_request_handler(request: Request, exc: BadRequestError):
+    return JSONResponse(
+        status_code=400,
+        content=BaseResponse(status="Error", message=str(exc), data=None).model_dump()
+    )
+
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 app.add_middleware(
@@ -36,13 +101,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Token read-your-writes untuk client yang tidak menyimpan cookie
+    expose_headers=["X-Read-Your-Writes"],
+)
+
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    # Ruang untuk boundary dan header multipart di luar isi file
+    max_size=settings.UPLOAD_MAX_BYTES + 64 * 1024,
+    paths=settings.UPLOAD_PATHS,
 )
 
+if replica_engine is not None:
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.DB_READ_YOUR_WRITES_SECONDS)
+
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        exclude_paths=settings.COMPRESSION_EXCLUDE_PATHS,
+        cache_entries=settings.COMPRESSION_CACHE_ENTRIES,
+    )
+
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(products.router, prefix="/api/v1")
 app.include_router(customers.router, prefix="/api/v1")
 app.include_router(orders.router, prefix="/api/v1")
 app.include_router(upload.router, prefix="/api/v1")
+app.include_router(stats.router, prefix="/api/v1")
+app.include_router(search.router, prefix="/api/v1")
+app.include_router(system.router, prefix="/api/v1")
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -2,3 +2,8 @@ from .customer_models import Customer
 from .order_models import Order
 from .product_models import Product
 from .user_models import User
+from .stats_models import LocationStat, OrderDailyStat, ProductQuantityStat
+from .version_models import ResourceVersion
+from .token_models import RevokedToken
+from .upload_models import UploadObject
+from .report_models import ReportRefresh
@@ -1,8 +1,17 @@
+from datetime import datetime
 import uuid
-from sqlalchemy import UUID, ForeignKey, String, Text
+from sqlalchemy import UUID, Computed, ForeignKey, Index, String, Text, text
 from app.core.database import Base
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+CUSTOMER_NAME_KEY_SQL = "lower(regexp_replace(btrim(name), '\\s+', ' ', 'g'))"
+
+CUSTOMER_SEARCH_SQL = (
+    "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(receiver_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(address, '') || ' ' || coalesce(address_2, '') || ' ' || coalesce(suburb, '')), 'C')"
+)
+
 class Customer(Base):
     __tablename__ = "customers"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -15,5 +24,15 @@ class Customer(Base):
     state: Mapped[str] = mapped_column(String(255), nullable=True)
     receiver_name: Mapped[str] = mapped_column(String(255), nullable=True)
     post_code: Mapped[str] = mapped_column(nullable=True)
+    # server_default sama dengan migration 792c9780d79c, untuk row lama sebelum kolom ini ada
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, server_default=text("(now() AT TIME ZONE 'utc')"))
+    search_vector = mapped_column(TSVECTOR, Computed(CUSTOMER_SEARCH_SQL, persisted=True), deferred=True, deferred_raiseload=True)
+    # Nama ternormalisasi (lowercase, spasi dirapikan) sebagai key upsert per user
+    name_key: Mapped[str] = mapped_column(String(255), Computed(CUSTOMER_NAME_KEY_SQL, persisted=True))
+
+    user = relationship("User", back_populates="customers", lazy="raise")
 
-    user = relationship("User", back_populates="customers", lazy="selectin")
\ No newline at end of file
+Index("ix_customers_user_id_created_at_id", Customer.user_id, Customer.created_at, Customer.id)
+Index("uq_customers_user_id_name_key", Customer.user_id, Customer.name_key, unique=True)
+Index("ix_customers_name_trgm", Customer.name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"})
+Index("ix_customers_user_id_search_vector", Customer.user_id, Customer.search_vector, postgresql_using="gin")
\ No newline at end of file
@@ -1,11 +1,20 @@
+import asyncio
 from datetime import datetime, date
+from typing import List
 import uuid
 
-from sqlalchemy import UUID, ForeignKey, String, Date, Integer, select
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import Base
+from sqlalchemy import UUID, Computed, ForeignKey, Index, String, Date, Integer
+from sqlalchemy.dialects.postgresql import TSVECTOR, insert as pg_insert
+from app.core.config import settings
+from app.core.database import Base, engine
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+ORDER_SEARCH_SQL = (
+    "setweight(to_tsvector('simple', coalesce(order_id, '') || ' ' || coalesce(order_reference_number, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(receiver_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(address, '') || ' ' || coalesce(address_2, '') || ' ' || coalesce(suburb, '')), 'C')"
+)
+
 class Order(Base):
     __tablename__ = "orders"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -24,47 +33,108 @@ class Order(Base):
     post_code: Mapped[str] = mapped_column(nullable=True)
     phone_number: Mapped[str] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    # Full-text search, di-maintain oleh Postgres
+    search_vector = mapped_column(TSVECTOR, Computed(ORDER_SEARCH_SQL, persisted=True), deferred=True, deferred_raiseload=True)
+
+    user = relationship("User", back_populates="orders", lazy="raise")
+    order_items = relationship("OrderItem", back_populates="order", lazy="raise", cascade="all, delete-orphan")
+
+Index("ix_orders_user_id_created_at_id", Order.user_id, Order.created_at, Order.id)
+Index("ix_orders_user_id_search_vector", Order.user_id, Order.search_vector, postgresql_using="gin")
 
-    user = relationship("User", back_populates="orders", lazy="selectin")
-    order_items = relationship("OrderItem", back_populates="order", lazy="selectin", cascade="all, delete-orphan")
+ORDER_ITEM_SEARCH_SQL = "to_tsvector('simple', coalesce(product_name, ''))"
 
 class OrderItem(Base):
     __tablename__ = "order_items"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    order_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("orders.id"))
+    order_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("orders.id"), index=True)
+    # Salinan orders.user_id supaya index search item bisa dibatasi per user
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
     product_name: Mapped[str] = mapped_column(String(255), nullable=False)
     order_qty: Mapped[int] = mapped_column(nullable=False)
     file_url: Mapped[str] = mapped_column(nullable=True)
+    search_vector = mapped_column(TSVECTOR, Computed(ORDER_ITEM_SEARCH_SQL, persisted=True), deferred=True, deferred_raiseload=True)
+
+    order = relationship("Order", back_populates="order_items", lazy="raise")
 
-    order = relationship("Order", back_populates="order_items", lazy="selectin")
+Index("ix_order_items_user_id_search_vector", OrderItem.user_id, OrderItem.search_vector, postgresql_using="gin")
 
 class OrderSequence(Base):
     __tablename__ = "order_sequences"
     date: Mapped[date] = mapped_column(Date, primary_key=True)
     sequence_number: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
-async def generate_order_id(db: AsyncSession) -> str:
-    """Generate order_id dengan format DDMMYY-0000+n yang reset setiap hari"""
-    today = date.today()
-    
-    # Cek apakah sudah ada sequence untuk hari ini
-    result = await db.execute(
-        select(OrderSequence).where(OrderSequence.date == today)
+async def _reserve_sequence(conn, today: date, count: int) -> int:
+    """Naikkan sequence hari ini sebanyak count dalam satu statement, return nilai tertinggi"""
+    stmt = (
+        pg_insert(OrderSequence)
+        .values(date=today, sequence_number=count)
+        .on_conflict_do_update(
+            index_elements=[OrderSequence.date],
+            set_={"sequence_number": OrderSequence.sequence_number + count},
+        )
+        .returning(OrderSequence.sequence_number)
     )
-    sequence_record = result.scalar_one_or_none()
-    
-    if sequence_record is None:
-        # Buat record baru untuk hari ini
-        sequence_record = OrderSequence(date=today, sequence_number=1)
-        db.add(sequence_record)
-    else:
-        # Increment sequence yang sudah ada
-        sequence_record.sequence_number += 1
-    
-    await db.flush()  # Pastikan perubahan tersimpan
-    
+    result = await conn.execute(stmt)
+    return result.scalar_one()
+
+
+class OrderSequenceBlockAllocator:
+    """Reservasi range sequence per worker supaya create order tidak antri di satu row.
+
+    Block direservasi di transaksi sendiri dan langsung di-commit, jadi lock row
+    order_sequences hanya dipegang sebentar. Nomor yang tidak terpakai saat worker
+    restart akan bolong, dan urutan antar worker tidak dijamin monoton.
+    """
+
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        self._lock = asyncio.Lock()
+        self._date = None
+        self._next = 0
+        self._end = -1
+
+    async def take(self, today: date, count: int = 1) -> List[int]:
+        async with self._lock:
+            sequences = []
+            while len(sequences) < count:
+                if self._date != today or self._next > self._end:
+                    size = max(self.block_size, count - len(sequences))
+                    async with engine.begin() as conn:
+                        end = await _reserve_sequence(conn, today, size)
+                    self._date, self._next, self._end = today, end - size + 1, end
+                take = min(count - len(sequences), self._end - self._next + 1)
+                sequences.extend(range(self._next, self._next + take))
+                self._next += take
+            return sequences
+
+
+_block_allocator = OrderSequenceBlockAllocator(settings.ORDER_ID_BLOCK_SIZE)
+
+def _format_order_id(today: date, sequence_number: int) -> str:
     # Format: DDMMYY-0000+n
-    date_str = today.strftime("%d%m%y")
-    sequence_str = f"{sequence_record.sequence_number:04d}"
-    
-    return f"{date_str}-{sequence_str}"
\ No newline at end of file
+    return f"{today.strftime('%d%m%y')}-{sequence_number:04d}"
+
+async def generate_order_ids(count: int) -> List[str]:
+    """Generate sejumlah order_id sekaligus dengan format DDMMYY-0000+n yang reset setiap hari.
+
+    Sequence selalu direservasi di transaksi sendiri yang langsung di-commit, bukan di
+    transaksi request, jadi row order_sequences tidak terkunci selama order ditulis.
+    Nomor bisa bolong kalau transaksi request akhirnya gagal.
+    """
+    today = date.today()
+    if count <= 0:
+        return []
+
+    if settings.ORDER_ID_BLOCK_SIZE > 1:
+        sequences = await _block_allocator.take(today, count)
+    else:
+        async with engine.begin() as conn:
+            end = await _reserve_sequence(conn, today, count)
+        sequences = range(end - count + 1, end + 1)
+
+    return [_format_order_id(today, seq) for seq in sequences]
+
+async def generate_order_id() -> str:
+    """Generate order_id dengan format DDMMYY-0000+n yang reset setiap hari"""
+    return (await generate_order_ids(1))[0]
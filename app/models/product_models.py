@@ -1,10 +1,16 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import UUID, ForeignKey, String, Text
+from sqlalchemy import UUID, Computed, ForeignKey, Index, String, Text, func
 from app.core.database import Base
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+PRODUCT_SEARCH_SQL = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+
 class Product(Base):
     __tablename__ = "products"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -12,5 +18,11 @@ class Product(Base):
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    search_vector = mapped_column(TSVECTOR, Computed(PRODUCT_SEARCH_SQL, persisted=True), deferred=True, deferred_raiseload=True)
+
+    user = relationship("User", back_populates="products", lazy="raise")
 
-    user = relationship("User", back_populates="products", lazy="selectin")
\ No newline at end of file
+Index("ix_products_user_id_created_at_id", Product.user_id, Product.created_at, Product.id)
+Index("uq_products_user_id_lower_name", Product.user_id, func.lower(Product.name), unique=True)
+Index("ix_products_name_trgm", Product.name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"})
+Index("ix_products_user_id_search_vector", Product.user_id, Product.search_vector, postgresql_using="gin")
\ No newline at end of file
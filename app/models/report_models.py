@@ -0,0 +1,13 @@
+from datetime import datetime
+
+from sqlalchemy import String
+from app.core.database import Base
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Waktu refresh terakhir per job, dibaca semua worker supaya refresh tidak diulang
+# oleh worker lain di interval yang sama
+
+class ReportRefresh(Base):
+    __tablename__ = "report_refreshes"
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    refreshed_at: Mapped[datetime] = mapped_column(nullable=False)
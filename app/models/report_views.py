@@ -0,0 +1,39 @@
+from sqlalchemy import UUID, Column, Date, DateTime, Integer, MetaData, String, Table
+
+# Materialized view (lihat migration e3987e07735f), sengaja tidak pakai Base.metadata
+# supaya alembic autogenerate tidak membuatnya sebagai tabel
+report_metadata = MetaData()
+
+MonthlyOrderVolume = Table(
+    "mv_monthly_order_volumes",
+    report_metadata,
+    Column("user_id", UUID(as_uuid=True)),
+    Column("month", Date),
+    Column("order_count", Integer),
+    Column("total_qty", Integer),
+)
+
+TopProduct = Table(
+    "mv_top_products",
+    report_metadata,
+    Column("user_id", UUID(as_uuid=True)),
+    Column("product_key", String),
+    Column("product_name", String),
+    Column("total_qty", Integer),
+    Column("order_count", Integer),
+)
+
+OverdueOrder = Table(
+    "mv_overdue_orders",
+    report_metadata,
+    Column("id", UUID(as_uuid=True)),
+    Column("user_id", UUID(as_uuid=True)),
+    Column("order_id", String),
+    Column("order_reference_number", String),
+    Column("name", String),
+    Column("due_date", DateTime),
+    Column("item_count", Integer),
+    Column("total_qty", Integer),
+)
+
+REPORT_VIEWS = (MonthlyOrderVolume.name, TopProduct.name, OverdueOrder.name)
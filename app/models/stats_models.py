@@ -0,0 +1,29 @@
+from datetime import date
+import uuid
+
+from sqlalchemy import UUID, Date, ForeignKey, Integer, String
+from app.core.database import Base
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Tabel ringkasan untuk dashboard, di-update dengan delta di transaksi yang sama dengan order
+
+class OrderDailyStat(Base):
+    __tablename__ = "order_daily_stats"
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    order_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+class ProductQuantityStat(Base):
+    __tablename__ = "product_quantity_stats"
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    product_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    product_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    total_qty: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+class LocationStat(Base):
+    __tablename__ = "location_stats"
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    # State/suburb kosong disimpan sebagai '' karena bagian dari primary key
+    state: Mapped[str] = mapped_column(String, primary_key=True)
+    suburb: Mapped[str] = mapped_column(String, primary_key=True)
+    order_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
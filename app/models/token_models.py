@@ -0,0 +1,20 @@
+from datetime import datetime
+import uuid
+
+from sqlalchemy import UUID, ForeignKey, Index
+from app.core.database import Base
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Token (access/refresh) yang dicabut sebelum exp, row dihapus setelah expires_at lewat
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+    jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(nullable=False)
+    revoked_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
+
+
+# Sync incremental ke Bloom filter membaca row dengan revoked_at lebih baru dari watermark
+Index("ix_revoked_tokens_revoked_at", RevokedToken.revoked_at)
+Index("ix_revoked_tokens_expires_at", RevokedToken.expires_at)
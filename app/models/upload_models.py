@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, Index, String
+from app.core.database import Base
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Satu row per file upload per user (key = HMAC user_id + SHA-256 isi), ref_count = jumlah
+# order_items yang menunjuk ke file ini. Row dengan ref_count 0 dihapus GC setelah grace
+# period. Row bisa dibuat oleh referensi sebelum upload, sha256 dan size baru terisi saat
+# file di-upload
+
+class UploadObject(Base):
+    __tablename__ = "upload_objects"
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    size: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    ref_count: Mapped[int] = mapped_column(default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
+    last_uploaded_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
+
+
+# Mencari file user lain dengan isi yang sama untuk di-hard link
+Index("ix_upload_objects_sha256", UploadObject.sha256)
+# GC hanya membaca file yang tidak direferensikan
+Index(
+    "ix_upload_objects_unreferenced",
+    UploadObject.last_uploaded_at,
+    postgresql_where=UploadObject.ref_count <= 0,
+)
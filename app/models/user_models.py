@@ -24,6 +24,6 @@ class User(Base):
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
     last_login: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    products = relationship("Product", back_populates="user", lazy="selectin")
-    customers = relationship("Customer", back_populates="user", lazy="selectin")
-    orders = relationship("Order", back_populates="user", lazy="selectin")
\ No newline at end of file
+    products = relationship("Product", back_populates="user", lazy="raise")
+    customers = relationship("Customer", back_populates="user", lazy="raise")
+    orders = relationship("Order", back_populates="user", lazy="raise")
\ No newline at end of file
@@ -0,0 +1,13 @@
+import uuid
+
+from sqlalchemy import UUID, BigInteger, ForeignKey, String
+from app.core.database import Base
+from sqlalchemy.orm import Mapped, mapped_column
+
+# Versi data per user dan resource, naik di transaksi yang sama dengan write (dipakai untuk ETag)
+
+class ResourceVersion(Base):
+    __tablename__ = "resource_versions"
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    resource: Mapped[str] = mapped_column(String(32), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
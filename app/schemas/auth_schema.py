@@ -24,5 +24,13 @@ class AuthLogin(BaseModel):
 class AuthLoginOut(BaseModel):
     id: UUID4
     accessToken: str
+    refreshToken: str
     token_type: str
-    role: RoleEnum
\ No newline at end of file
+    expires_in: int
+    role: RoleEnum
+
+class AuthRefresh(BaseModel):
+    refreshToken: str
+
+class AuthLogout(BaseModel):
+    refreshToken: Optional[str] = None
\ No newline at end of file
@@ -35,4 +35,16 @@ class CustomerResponse(CustomerBase):
 
 
 class CustomerWithUserResponse(CustomerResponse):
-    user: Optional[AuthRegisterOut] = Field(None, description="Associated user information")
\ No newline at end of file
+    user: Optional[AuthRegisterOut] = Field(None, description="Associated user information")
+
+
+class CustomerSuggestion(BaseModel):
+    id: UUID4 = Field(..., description="Customer ID")
+    name: str = Field(..., description="Customer name")
+    phone_number: Optional[str] = None
+    address: Optional[str] = None
+    address_2: Optional[str] = None
+    suburb: Optional[str] = None
+    state: Optional[str] = None
+    receiver_name: Optional[str] = None
+    post_code: Optional[str] = None
@@ -23,4 +23,10 @@ class ProductResponse(ProductBase):
     created_at: datetime = Field(..., description="Product creation timestamp")
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ProductSuggestion(BaseModel):
+    id: UUID4 = Field(..., description="Product ID")
+    name: str = Field(..., description="Product name")
+    description: Optional[str] = None
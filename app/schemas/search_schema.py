@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import UUID4, BaseModel, Field
+
+
+class SearchHit(BaseModel):
+    type: str = Field(..., description="order, customer or product")
+    id: UUID4 = Field(..., description="ID of the matched resource")
+    title: str = Field(..., description="Order number, customer name or product name")
+    subtitle: Optional[str] = Field(None, description="Order customer, customer address or product description")
+    rank: float = Field(..., description="Relevance, higher is better")
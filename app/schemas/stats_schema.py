@@ -0,0 +1,47 @@
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import UUID4, BaseModel, Field
+
+
+class OrdersPerDay(BaseModel):
+    day: date = Field(..., description="Order issue date")
+    order_count: int = Field(..., description="Number of orders issued on this day")
+
+
+class ProductQuantity(BaseModel):
+    product_name: str = Field(..., description="Product name")
+    total_qty: int = Field(..., description="Total ordered quantity")
+
+
+class LocationCount(BaseModel):
+    state: Optional[str] = Field(None, description="State")
+    suburb: Optional[str] = Field(None, description="Suburb")
+    order_count: int = Field(..., description="Number of orders shipped to this location")
+
+
+class StatsResponse(BaseModel):
+    orders_per_day: List[OrdersPerDay] = Field(default=[], description="Orders per issue day")
+    product_quantities: List[ProductQuantity] = Field(default=[], description="Quantity per product, highest first")
+    locations: List[LocationCount] = Field(default=[], description="Orders per state/suburb, highest first")
+
+
+class MonthlyVolume(BaseModel):
+    month: date = Field(..., description="First day of the month")
+    order_count: int = Field(..., description="Orders issued in this month")
+    total_qty: int = Field(..., description="Total ordered quantity in this month")
+
+
+class TopProduct(BaseModel):
+    product_name: str = Field(..., description="Product name")
+    total_qty: int = Field(..., description="Total ordered quantity")
+    order_count: int = Field(..., description="Number of orders containing this product")
+
+
+class OverdueOrder(BaseModel):
+    id: UUID4 = Field(..., description="Order ID")
+    order_id: Optional[str] = Field(None, description="Order number")
+    order_reference_number: str = Field(..., description="Order reference number")
+    name: str = Field(..., description="Customer name")
+    due_date: datetime = Field(..., description="Order due date")
+    item_count: int = Field(..., description="Number of order items")
+    total_qty: int = Field(..., description="Total ordered quantity")
@@ -13,10 +13,13 @@ class BaseResponse(BaseModel, Generic[T]):
     status: str = "Success"
     message: str
     data: T | None = None
+    next_cursor: str | None = None
 
 class TokenData(BaseModel):
     user_id: UUID4
-    # role: RoleEnum
+    jti: UUID4 | None = None
+    # Token lama tanpa claim role tetap valid, tapi tidak dianggap admin
+    role: RoleEnum | None = None
 
 class SysConfigurationBase(BaseModel):
     key: str
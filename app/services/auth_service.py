@@ -1,13 +1,17 @@
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user_models import User
 from app.repositories.auth_repository import AuthRepository
 from app.schemas.auth_schema import AuthLogin, AuthRegister
-from passlib.context import CryptContext
-
-from app.utils.sys import create_access_token
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated=["auto"])
+from app.services.token_service import TokenService
+from app.utils.passwords import hash_password, verify_password
+from app.utils.revocation import revocation_list
+from app.utils.sys import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token, create_refresh_token, decode_token
 
 class AuthService:
     def __init__(self, db: AsyncSession):
@@ -19,23 +23,82 @@ class AuthService:
         if not user:
             return None
         
-        if not pwd_context.verify(data.password, user.password):
+        valid, new_hash = await verify_password(data.password, user.password)
+        if not valid:
             return None
+
+        if new_hash:
+            # Cost hash berubah, simpan ulang selagi password plaintext tersedia
+            user.password = new_hash
+            await self.db.commit()
         
-        token = create_access_token(data={"sub":str(user.id), "role": user.role})
-        if not token:
+        return self._issue_tokens(user)
+
+    def _issue_tokens(self, user: User):
+        claims = {"sub": str(user.id), "role": user.role}
+        token = create_access_token(data=claims)
+        refresh_token = create_refresh_token(data=claims)
+        if not token or not refresh_token:
             return None
 
         return {
             "role": user.role,
             "accessToken": str(token),
+            "refreshToken": str(refresh_token),
             "token_type": "Bearer",
+            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
             "id": user.id
         }
 
+    async def refresh(self, refresh_token: str):
+        """Tukar refresh token dengan pasangan token baru, refresh token lama langsung dicabut"""
+        try:
+            payload = decode_token(refresh_token, "refresh")
+        except HTTPException:
+            return None
+        if payload.get("jti") is None:
+            return None
+
+        user = await self.repo.get_by_id(payload["sub"])
+        if not user:
+            return None
+
+        # Insert ke revoked_tokens atomik, refresh token yang sama hanya bisa dipakai sekali
+        jti = uuid.UUID(payload["jti"])
+        if not await TokenService(self.db).revoke(jti, user.id, datetime.utcfromtimestamp(payload["exp"])):
+            await self.db.rollback()
+            return None
+        await self.db.commit()
+        revocation_list.add(jti)
+
+        return self._issue_tokens(user)
+
+    async def logout(self, access_token: str, refresh_token: Optional[str] = None):
+        """Cabut access token yang dipakai dan refresh token milik user yang sama"""
+        tokens = [decode_token(access_token)]
+        if refresh_token:
+            try:
+                tokens.append(decode_token(refresh_token, "refresh"))
+            except HTTPException:
+                pass
+
+        service = TokenService(self.db)
+        revoked = []
+        for payload in tokens:
+            if payload.get("jti") is None or payload["sub"] != tokens[0]["sub"]:
+                continue
+            jti = uuid.UUID(payload["jti"])
+            await service.revoke(jti, uuid.UUID(payload["sub"]), datetime.utcfromtimestamp(payload["exp"]))
+            revoked.append(jti)
+        await self.db.commit()
+
+        for jti in revoked:
+            revocation_list.add(jti)
+        return {"revoked": len(revoked)}
+
     async def register(self, data: AuthRegister):
         try:
-            hashed = pwd_context.hash(data.password)
+            hashed = await hash_password(data.password)
             user = User(**data.dict(exclude={"password"}), password=hashed)
             result = await self.repo.register(user)
 
@@ -1,11 +1,34 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Integer, String, column, literal, literal_column, or_, select, tuple_, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 import uuid
 
-from app.models.customer_models import Customer
+from app.models.customer_models import CUSTOMER_NAME_KEY_SQL, Customer
 from app.schemas.customer_schema import CustomerCreate, CustomerUpdate
+from app.schemas.order_schema import OrderCreate, OrderUpdate
 from app.schemas.sys_schema import TokenData
+from app.services.version_service import VersionService
+from app.utils.autocomplete import autocomplete_cache
+from app.utils.batches import chunked
+from app.utils.errors import ConflictError, is_unique_violation
+from app.utils.fields import Fields, load_only_fields
+from app.utils.pagination import Cursor
+
+CUSTOMER_NAME_CONSTRAINT = "uq_customers_user_id_name_key"
+
+# Field customer yang disalin dari setiap order
+ORDER_CUSTOMER_FIELDS = (
+    "address",
+    "receiver_name",
+    "address_2",
+    "suburb",
+    "state",
+    "phone_number",
+    "post_code",
+)
 
 
 class CustomerService:
@@ -27,27 +50,135 @@ class CustomerService:
             )
             
             self.db.add(db_customer)
+            autocomplete_cache.invalidate_on_commit(self.db, ("customer", user.user_id))
+            await VersionService(self.db).touch(user, "customers")
             await self.db.commit()
             await self.db.refresh(db_customer)
             
             return db_customer
             
+        except IntegrityError as e:
+            await self.db.rollback()
+            if is_unique_violation(e, CUSTOMER_NAME_CONSTRAINT):
+                raise ConflictError(f"Customer dengan nama '{customer_data.name}' sudah ada")
+            raise Exception(f"Error creating customer: {e}")
         except Exception as e:
             await self.db.rollback()
             raise Exception(f"Error creating customer: {e}")
 
-    async def get_customers(self, user: TokenData, skip: int = 0, limit: int = 100) -> List[Customer]:
+    async def upsert_from_order(self, order_data: Union[OrderCreate, OrderUpdate], user: TokenData) -> None:
+        """Insert/update customer dari data order berdasarkan (user_id, name_key), tanpa commit"""
+        await self.upsert_from_orders([order_data], user)
+
+    async def upsert_from_orders(self, orders: Iterable[Union[OrderCreate, OrderUpdate]], user: TokenData) -> None:
+        """Upsert banyak customer, satu statement per chunk, tanpa commit.
+
+        Row hanya di-update kalau ada field yang benar-benar berubah. Kalau beberapa
+        order punya customer yang sama, data order terakhir yang dipakai. Dedup memakai
+        ekspresi yang sama persis dengan kolom generated name_key (normalisasi di Python
+        bisa berbeda dengan regexp/lower Postgres), dan hasilnya terurut berdasarkan key
+        supaya upsert yang bersamaan mengunci row dengan urutan yang sama.
+        """
+        rows = [
+            (position, uuid.uuid4(), order_data.name, *(getattr(order_data, field) for field in ORDER_CUSTOMER_FIELDS))
+            for position, order_data in enumerate(orders)
+            if order_data.name
+        ]
+        if not rows:
+            return
+
+        now = datetime.utcnow()
+        name_key = literal_column(CUSTOMER_NAME_KEY_SQL)
+        updated = 0
+        # Chunk diproses sesuai urutan order, jadi order terakhir tetap menang antar chunk
+        for chunk in chunked(rows, len(rows[0])):
+            source = values(
+                column("position", Integer),
+                column("id", Customer.id.type),
+                column("name", String),
+                *(column(field, String) for field in ORDER_CUSTOMER_FIELDS),
+                name="source",
+            ).data(chunk)
+            latest = (
+                select(
+                    source.c.id,
+                    literal(user.user_id, Customer.user_id.type),
+                    source.c.name,
+                    literal(now, Customer.created_at.type),
+                    *(source.c[field] for field in ORDER_CUSTOMER_FIELDS),
+                )
+                .distinct(name_key)
+                .order_by(name_key, source.c.position.desc())
+            )
+            stmt = pg_insert(Customer).from_select(
+                ["id", "user_id", "name", "created_at", *ORDER_CUSTOMER_FIELDS], latest
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Customer.user_id, Customer.name_key],
+                set_={field: stmt.excluded[field] for field in ORDER_CUSTOMER_FIELDS},
+                where=or_(*(
+                    getattr(Customer, field).is_distinct_from(stmt.excluded[field])
+                    for field in ORDER_CUSTOMER_FIELDS
+                ))
+            )
+            # rowcount hanya menghitung row yang di-insert atau benar-benar berubah
+            updated += (await self.db.execute(stmt)).rowcount
+        if updated:
+            autocomplete_cache.invalidate_on_commit(self.db, ("customer", user.user_id))
+            await VersionService(self.db).touch(user, "customers")
+
+    async def suggest_customers(self, user: TokenData, q: str, limit: int = 10) -> List[dict]:
+        """Autocomplete nama customer dari index di memory, DB hanya dipakai saat index belum ada"""
+        async def load():
+            result = await self.db.execute(
+                select(
+                    Customer.id, Customer.name, Customer.phone_number, Customer.address,
+                    Customer.address_2, Customer.suburb, Customer.state,
+                    Customer.receiver_name, Customer.post_code,
+                )
+                .where(Customer.user_id == user.user_id)
+            )
+            return [(row["name"], dict(row)) for row in result.mappings()]
+
+        try:
+            index = await autocomplete_cache.get(("customer", user.user_id), load)
+            return index.search(q, limit)
+
+        except Exception as e:
+            raise Exception(f"Error suggesting customers: {e}")
+
+    async def get_customers(
+        self,
+        user: TokenData,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        fields: Fields = None,
+    ) -> List[Customer]:
         try:
-            query = select(Customer).where(Customer.user_id == user.user_id).offset(skip).limit(limit)
+            query = (
+                select(Customer)
+                .where(Customer.user_id == user.user_id)
+                .order_by(Customer.created_at.desc(), Customer.id.desc())
+                .limit(limit)
+            )
+            if fields:
+                query = query.options(load_only_fields(Customer, fields, Customer.created_at))
+            if cursor:
+                query = query.where(tuple_(Customer.created_at, Customer.id) < cursor)
+            else:
+                query = query.offset(skip)
             result = await self.db.execute(query)
             return result.scalars().all()
             
         except Exception as e:
             raise Exception(f"Error getting customers: {e}")
 
-    async def get_customer_by_id(self, customer_id: uuid.UUID, user: TokenData) -> Optional[Customer]:
+    async def get_customer_by_id(self, customer_id: uuid.UUID, user: TokenData, fields: Fields = None) -> Optional[Customer]:
         try:
             query = select(Customer).where(Customer.id == customer_id, Customer.user_id == user.user_id)
+            if fields:
+                query = query.options(load_only_fields(Customer, fields))
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
             
@@ -69,11 +200,18 @@ class CustomerService:
             if customer_data.receiver_name is not None:
                 db_customer.receiver_name = customer_data.receiver_name
             
+            autocomplete_cache.invalidate_on_commit(self.db, ("customer", user.user_id))
+            await VersionService(self.db).touch(user, "customers")
             await self.db.commit()
             await self.db.refresh(db_customer)
             
             return db_customer
             
+        except IntegrityError as e:
+            await self.db.rollback()
+            if is_unique_violation(e, CUSTOMER_NAME_CONSTRAINT):
+                raise ConflictError(f"Customer dengan nama '{customer_data.name}' sudah ada")
+            raise Exception(f"Error updating customer: {e}")
         except Exception as e:
             await self.db.rollback()
             raise Exception(f"Error updating customer: {e}")
@@ -86,6 +224,8 @@ class CustomerService:
                 return False
             
             await self.db.delete(db_customer)
+            autocomplete_cache.invalidate_on_commit(self.db, ("customer", user.user_id))
+            await VersionService(self.db).touch(user, "customers")
             await self.db.commit()
             
             return True
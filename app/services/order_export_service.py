@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order_models import Order, OrderItem
+from app.schemas.sys_schema import TokenData
+from app.utils.dates import naive_utc
+
+# Satu baris per item, order tanpa item tetap keluar satu baris dengan kolom item kosong
+EXPORT_COLUMNS = (
+    Order.order_id,
+    Order.order_reference_number,
+    Order.issues_date,
+    Order.due_date,
+    Order.name,
+    Order.address,
+    Order.address_2,
+    Order.suburb,
+    Order.state,
+    Order.receiver_name,
+    Order.post_code,
+    Order.phone_number,
+    Order.created_at,
+    OrderItem.product_name,
+    OrderItem.order_qty,
+    OrderItem.file_url,
+)
+EXPORT_HEADER = tuple(column.key for column in EXPORT_COLUMNS)
+
+STREAM_BATCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+
+
+class OrderExportService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def stream_rows(
+        self,
+        user: TokenData,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> AsyncIterator[tuple]:
+        """Baris export dari server-side cursor, tanpa membuat objek ORM.
+
+        Query dieksekusi dan partisi pertama diambil sebelum return, jadi error query
+        muncul di sini, bukan setelah status 200 terkirim di tengah stream.
+        """
+        query = (
+            select(*EXPORT_COLUMNS)
+            .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+            .where(Order.user_id == user.user_id)
+            .order_by(Order.created_at, Order.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        # created_at disimpan naive UTC, asyncpg menolak membandingkan dengan datetime aware
+        if date_from:
+            query = query.where(Order.created_at >= naive_utc(date_from))
+        if date_to:
+            query = query.where(Order.created_at < naive_utc(date_to))
+
+        result = await self.db.stream(query)
+        partitions = result.partitions()
+        first = await anext(partitions, [])
+        return _rows(first, partitions)
+
+
+async def _rows(first: Sequence, partitions: AsyncIterator[Sequence]) -> AsyncIterator[tuple]:
+    for row in first:
+        yield tuple(row)
+    async for partition in partitions:
+        for row in partition:
+            yield tuple(row)
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def _chunked(lines: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Kumpulkan baris sampai ~64KB per chunk supaya tidak kirim satu write per baris"""
+    parts = []
+    size = 0
+    async for line in lines:
+        parts.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(parts).encode()
+            parts = []
+            size = 0
+    if parts:
+        yield "".join(parts).encode()
+
+
+async def _csv_lines(rows: AsyncIterator[tuple]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    async for row in rows:
+        writer.writerow([_value(value) for value in row])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+async def _ndjson_lines(rows: AsyncIterator[tuple]) -> AsyncIterator[str]:
+    async for row in rows:
+        yield json.dumps(dict(zip(EXPORT_HEADER, (_value(value) for value in row)))) + "\n"
+
+
+async def encode_csv(rows: AsyncIterator[tuple]) -> AsyncIterator[bytes]:
+    header = io.StringIO()
+    csv.writer(header).writerow(EXPORT_HEADER)
+    # Header langsung dikirim tanpa menunggu partisi berikutnya
+    yield header.getvalue().encode()
+    async for chunk in _chunked(_csv_lines(rows)):
+        yield chunk
+
+
+async def encode_ndjson(rows: AsyncIterator[tuple]) -> AsyncIterator[bytes]:
+    async for chunk in _chunked(_ndjson_lines(rows)):
+        yield chunk
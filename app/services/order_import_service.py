@@ -0,0 +1,224 @@
+import csv
+import json
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.order_models import generate_order_ids
+from app.schemas.order_schema import OrderCreate
+from app.schemas.sys_schema import TokenData
+from app.services.customer_service import CustomerService
+from app.services.product_service import ProductService
+from app.services.stats_service import StatsDelta, StatsService
+from app.services.upload_service import FileRefs, UploadService
+from app.services.version_service import VersionService
+from app.utils.dates import naive_utc
+
+# Kolom CSV, satu baris = satu item; baris berurutan dengan order_reference_number sama = satu order
+CSV_ORDER_FIELDS = (
+    "order_reference_number",
+    "issues_date",
+    "due_date",
+    "name",
+    "address",
+    "receiver_name",
+    "address_2",
+    "suburb",
+    "state",
+    "post_code",
+    "phone_number",
+)
+CSV_ITEM_FIELDS = ("product_name", "order_qty", "file_url")
+
+ORDER_COPY_COLUMNS = (
+    "id", "order_id", "user_id", "order_reference_number", "issues_date", "due_date",
+    "name", "address", "address_2", "suburb", "state", "receiver_name", "post_code",
+    "phone_number", "created_at",
+)
+ORDER_ITEM_COPY_COLUMNS = ("id", "order_id", "user_id", "product_name", "order_qty", "file_url")
+
+MAX_REPORTED_ERRORS = 1000
+
+# (nomor baris pertama, payload mentah atau error parsing)
+ParsedRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Pecah stream bytes menjadi baris tanpa membaca seluruh body"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+async def parse_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"JSON tidak valid: {e}"
+
+
+async def parse_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    header = None
+    line_number = 0
+    pending = ""
+    record_line = 0
+    group: Optional[dict] = None
+    group_line = 0
+
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not pending:
+            record_line = line_number
+        # Field ber-quote bisa berisi newline, gabungkan sampai quote seimbang
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+
+        row = {key: (value if value != "" else None) for key, value in zip(header, values)}
+        item = {field: row.get(field) for field in CSV_ITEM_FIELDS}
+        reference = row.get("order_reference_number")
+
+        if group is not None and group["order_reference_number"] == reference:
+            group["order_items"].append(item)
+            continue
+
+        if group is not None:
+            yield group_line, group, None
+        group = {field: row.get(field) for field in CSV_ORDER_FIELDS}
+        group["order_items"] = [item]
+        group_line = record_line
+
+    if group is not None:
+        yield group_line, group, None
+    if pending:
+        yield record_line, None, "CSV tidak valid: quote tidak ditutup"
+
+
+class OrderImportService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def import_stream(self, chunks: AsyncIterator[bytes], format: str, user: TokenData) -> dict:
+        rows = parse_csv(chunks) if format == "csv" else parse_ndjson(chunks)
+        report = {"imported": 0, "failed": 0, "errors": []}
+        batch: List[Tuple[int, OrderCreate]] = []
+
+        async for line_number, payload, parse_error in rows:
+            if parse_error:
+                self._add_error(report, line_number, None, [parse_error])
+                continue
+            try:
+                batch.append((line_number, OrderCreate.model_validate(payload)))
+            except ValidationError as e:
+                errors = [f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()]
+                reference = payload.get("order_reference_number") if isinstance(payload, dict) else None
+                self._add_error(report, line_number, reference, errors)
+                continue
+
+            if len(batch) >= settings.ORDER_IMPORT_BATCH_SIZE:
+                await self._flush_batch(batch, user, report)
+                batch = []
+
+        if batch:
+            await self._flush_batch(batch, user, report)
+
+        return report
+
+    def _add_error(self, report: dict, line_number: int, reference: Optional[str], errors: List[str]) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({
+                "row": line_number,
+                "order_reference_number": reference,
+                "errors": errors,
+            })
+
+    async def _flush_batch(self, batch: List[Tuple[int, OrderCreate]], user: TokenData, report: dict) -> None:
+        """Simpan satu batch, kalau gagal batch dibelah dua dan dicoba ulang.
+
+        Satu order yang rusak hanya menggagalkan dirinya sendiri, order lain di batch
+        yang sama tetap tersimpan dengan paling banyak log2(batch) percobaan ulang.
+        """
+        try:
+            await self._write_batch([order for _, order in batch], user)
+            await self.db.commit()
+            report["imported"] += len(batch)
+        except Exception as e:
+            await self.db.rollback()
+            if len(batch) > 1:
+                middle = len(batch) // 2
+                await self._flush_batch(batch[:middle], user, report)
+                await self._flush_batch(batch[middle:], user, report)
+                return
+            line_number, order = batch[0]
+            self._add_error(report, line_number, order.order_reference_number, [f"Gagal menyimpan order: {e}"])
+
+    async def _write_batch(self, orders: List[OrderCreate], user: TokenData) -> None:
+        # Direservasi sebelum session memakai koneksi, sama seperti create_order
+        order_ids = await generate_order_ids(len(orders))
+
+        await CustomerService(self.db).upsert_from_orders(orders, user)
+
+        await ProductService(self.db).ensure_products(
+            (item.product_name for order in orders for item in order.order_items), user
+        )
+
+        now = datetime.utcnow()
+        order_records = []
+        item_records = []
+        for order, order_id in zip(orders, order_ids):
+            id = uuid.uuid4()
+            order_records.append((
+                id, order_id, user.user_id, order.order_reference_number,
+                naive_utc(order.issues_date), naive_utc(order.due_date),
+                order.name, order.address, order.address_2, order.suburb, order.state,
+                order.receiver_name, order.post_code, order.phone_number, now,
+            ))
+            item_records.extend(
+                (uuid.uuid4(), id, user.user_id, item.product_name, item.order_qty, item.file_url)
+                for item in order.order_items
+            )
+
+        delta = StatsDelta()
+        refs = FileRefs()
+        for order in orders:
+            # Tanggal sama dengan yang di-COPY, supaya update/delete mengurangi bucket yang sama
+            delta.add_order(
+                naive_utc(order.issues_date),
+                order.state,
+                order.suburb,
+                ((item.product_name, item.order_qty) for item in order.order_items),
+            )
+            refs.add_items(order.order_items)
+        await StatsService(self.db).apply(delta, user)
+        await UploadService(self.db).apply_refs(refs)
+        await VersionService(self.db).touch(user, "orders")
+
+        # COPY lewat koneksi asyncpg milik session, tetap di transaksi yang sama
+        connection = await self.db.connection()
+        raw_connection = (await connection.get_raw_connection()).driver_connection
+        await raw_connection.copy_records_to_table("orders", records=order_records, columns=ORDER_COPY_COLUMNS)
+        if item_records:
+            await raw_connection.copy_records_to_table("order_items", records=item_records, columns=ORDER_ITEM_COPY_COLUMNS)
@@ -1,15 +1,55 @@
+from collections import defaultdict
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete, select
+from sqlalchemy import insert, select, tuple_
 from datetime import datetime
 import uuid
 
-from app.models.customer_models import Customer
 from app.models.order_models import Order, OrderItem, generate_order_id
-from app.models.product_models import Product
-from app.schemas.order_schema import OrderCreate, OrderUpdate
+from app.models.user_models import User
+from app.schemas.order_schema import OrderCreate, OrderItemCreate, OrderUpdate
 from app.schemas.sys_schema import TokenData
-from sqlalchemy.orm import selectinload
+from app.services.customer_service import CustomerService
+from app.services.product_service import ProductService
+from app.services.stats_service import StatsDelta, StatsService
+from app.services.upload_service import FileRefs, UploadService
+from app.services.version_service import VersionService
+from app.utils.fields import Fields, load_only_fields
+from app.utils.pagination import Cursor
+from sqlalchemy.orm import joinedload, selectinload
+
+# Loader profile per response schema, relationship default-nya lazy="raise"
+ORDER_WITH_ITEMS_OPTIONS = (
+    selectinload(Order.order_items),
+    joinedload(Order.user).load_only(User.first_name, User.last_name, User.role),
+)
+
+
+def order_load_options(fields: Fields = None):
+    """Loader profile untuk ?fields=, relationship hanya di-load kalau diminta"""
+    if fields is None:
+        return ORDER_WITH_ITEMS_OPTIONS
+    options = [load_only_fields(Order, fields, Order.created_at)]
+    if "order_items" in fields:
+        options.append(selectinload(Order.order_items))
+    if "user" in fields:
+        options.append(joinedload(Order.user).load_only(User.first_name, User.last_name, User.role))
+    return options
+
+
+ORDER_UPDATE_FIELDS = (
+    "order_reference_number",
+    "issues_date",
+    "due_date",
+    "name",
+    "address",
+    "address_2",
+    "suburb",
+    "state",
+    "receiver_name",
+    "post_code",
+    "phone_number",
+)
 
 
 class OrderService:
@@ -18,55 +58,15 @@ class OrderService:
 
     async def create_order(self, order_data: OrderCreate, user: TokenData) -> Order:
         try:
-            # Debug logging for dates
-            print(f"Debug - Issues date: {order_data.issues_date} (type: {type(order_data.issues_date)})")
-            print(f"Debug - Due date: {order_data.due_date} (type: {type(order_data.due_date)})")
-            
             # Validate dates
             # if order_data.due_date <= order_data.issues_date:
             #     raise ValueError(f"Due date ({order_data.due_date}) must be after issues date ({order_data.issues_date})")
 
-            customer = (await self.db.execute(
-                select(Customer)
-                .where(
-                    Customer.name.ilike(order_data.name),
-                )
-            )).scalar_one_or_none()
-
-            if not customer:
-                customer = Customer(
-                    user_id=user.user_id,
-                    name=order_data.name,
-                    address=order_data.address,
-                    receiver_name=order_data.receiver_name,
-                    address_2=order_data.address_2,
-                    suburb=order_data.suburb,
-                    state=order_data.state,
-                    phone_number=order_data.phone_number,
-                    post_code=order_data.post_code
-                )
-                self.db.add(customer)
-                await self.db.flush()
-            else:
-                if customer.address != order_data.address:
-                    customer.address = order_data.address
-                if customer.receiver_name != order_data.receiver_name:
-                    customer.receiver_name = order_data.receiver_name
-                if customer.address_2 != order_data.address_2:
-                    customer.address_2 = order_data.address_2
-                if customer.suburb != order_data.suburb:
-                    customer.suburb = order_data.suburb
-                if customer.state != order_data.state:
-                    customer.state = order_data.state
-                if customer.phone_number != order_data.phone_number:
-                    customer.phone_number = order_data.phone_number
-                if customer.post_code != order_data.post_code:
-                    customer.post_code = order_data.post_code
-                await self.db.commit()
-                await self.db.refresh(customer)
+            # Generate order_id sebelum session memakai koneksi, reservasi memakai koneksi
+            # sendiri dan tidak boleh menunggu pool sambil memegang koneksi request
+            order_id = await generate_order_id()
 
-            # Generate order_id
-            order_id = await generate_order_id(self.db)
+            await CustomerService(self.db).upsert_from_order(order_data, user)
             
             # Create main order
             db_order = Order(
@@ -90,48 +90,74 @@ class OrderService:
             
             # Create order items if provided
             if order_data.order_items:
-                for item_data in order_data.order_items:
-                    product = (await self.db.execute(
-                        select(Product)
-                        .where(Product.name.ilike(item_data.product_name))
-                    )).scalar_one_or_none()
-                    if not product:
-                        product_model = Product(
-                            user_id=user.user_id,
-                            name=item_data.product_name
-                        )
-                        self.db.add(product_model)
-                        await self.db.flush()
-                        
-                    db_order_item = OrderItem(
-                        order_id=db_order.id,
-                        product_name=item_data.product_name,
-                        order_qty=item_data.order_qty,
-                        file_url=item_data.file_url
-                    )
-                    self.db.add(db_order_item)
+                await ProductService(self.db).ensure_products(
+                    (item_data.product_name for item_data in order_data.order_items), user
+                )
+                await self.db.execute(
+                    insert(OrderItem),
+                    [
+                        {
+                            "order_id": db_order.id,
+                            "user_id": db_order.user_id,
+                            "product_name": item_data.product_name,
+                            "order_qty": item_data.order_qty,
+                            "file_url": item_data.file_url,
+                        }
+                        for item_data in order_data.order_items
+                    ]
+                )
+
+            delta = StatsDelta()
+            delta.add_order_model(order_data)
+            await StatsService(self.db).apply(delta, user)
+
+            refs = FileRefs()
+            refs.add_items(order_data.order_items)
+            await UploadService(self.db).apply_refs(refs)
             
+            await VersionService(self.db).touch(user, "orders")
             await self.db.commit()
-            await self.db.refresh(db_order)
             
-            return db_order
+            return await self.get_order_by_id(db_order.id, user)
             
         except Exception as e:
             await self.db.rollback()
             raise Exception(f"Error creating order: {e}")
 
-    async def get_orders(self, user: TokenData, skip: int = 0, limit: int = 100) -> List[Order]:
+    async def get_orders(
+        self,
+        user: TokenData,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        fields: Fields = None,
+    ) -> List[Order]:
         try:
-            query = select(Order).where(Order.user_id == user.user_id).options(selectinload(Order.user)).offset(skip).limit(limit)
+            query = (
+                select(Order)
+                .where(Order.user_id == user.user_id)
+                .options(*order_load_options(fields))
+                .order_by(Order.created_at.desc(), Order.id.desc())
+                .limit(limit)
+            )
+            if cursor:
+                query = query.where(tuple_(Order.created_at, Order.id) < cursor)
+            else:
+                query = query.offset(skip)
             result = await self.db.execute(query)
             return result.scalars().all()
             
         except Exception as e:
             raise Exception(f"Error getting orders: {e}")
 
-    async def get_order_by_id(self, order_id: uuid.UUID, user: TokenData) -> Optional[Order]:
+    async def get_order_by_id(self, order_id: uuid.UUID, user: TokenData, fields: Fields = None) -> Optional[Order]:
         try:
-            query = select(Order).where(Order.id == order_id, Order.user_id == user.user_id)
+            query = (
+                select(Order)
+                .where(Order.id == order_id, Order.user_id == user.user_id)
+                .options(*order_load_options(fields))
+                .execution_options(populate_existing=True)
+            )
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
             
@@ -163,77 +189,32 @@ class OrderService:
             # if db_order.due_date <= db_order.issues_date:
             #     raise ValueError("Due date must be after issues date")
 
-            customer = (await self.db.execute(
-                select(Customer)
-                .where(
-                    Customer.name.ilike(order_data.name),
-                )
-            )).scalar_one_or_none()
+            await CustomerService(self.db).upsert_from_order(order_data, user)
 
-            if not customer:
-                customer = Customer(
-                    user_id=user.user_id,
-                    name=order_data.name,
-                    address=order_data.address,
-                    receiver_name=order_data.receiver_name,
-                    address_2=order_data.address_2,
-                    suburb=order_data.suburb,
-                    state=order_data.state,
-                    phone_number=order_data.phone_number,
-                    post_code=order_data.post_code
-                )
-                self.db.add(customer)
-                await self.db.flush()
-            else:
-                if customer.address != order_data.address:
-                    customer.address = order_data.address
-                if customer.receiver_name != order_data.receiver_name:
-                    customer.receiver_name = order_data.receiver_name
-                if customer.address_2 != order_data.address_2:
-                    customer.address_2 = order_data.address_2
-                if customer.suburb != order_data.suburb:
-                    customer.suburb = order_data.suburb
-                if customer.state != order_data.state:
-                    customer.state = order_data.state
-                if customer.phone_number != order_data.phone_number:
-                    customer.phone_number = order_data.phone_number
-                if customer.post_code != order_data.post_code:
-                    customer.post_code = order_data.post_code
-                await self.db.commit()
-                await self.db.refresh(customer)
+            delta = StatsDelta()
+            delta.add_order_model(db_order, sign=-1)
+            refs = FileRefs()
+            refs.add_items(db_order.order_items, sign=-1)
 
-            db_order.order_reference_number=order_data.order_reference_number
-            db_order.issues_date=order_data.issues_date
-            db_order.due_date=order_data.due_date
-            db_order.name=order_data.name
-            db_order.address=order_data.address
-            db_order.address_2=order_data.address_2
-            db_order.suburb=order_data.suburb
-            db_order.state=order_data.state
-            db_order.receiver_name=order_data.receiver_name
-            db_order.post_code=order_data.post_code
-            db_order.phone_number=order_data.phone_number
-            
-            await self.db.commit()
-            await self.db.refresh(db_order)
+            for field in ORDER_UPDATE_FIELDS:
+                value = getattr(order_data, field)
+                if getattr(db_order, field) != value:
+                    setattr(db_order, field, value)
 
-            await self.db.execute(
-                delete(OrderItem).where(OrderItem.order_id == db_order.id)
-            )
-            await self.db.commit()
+            new_items = self._reconcile_items(db_order, order_data.order_items)
+            if new_items:
+                await ProductService(self.db).ensure_products(
+                    (item.product_name for item in new_items), user
+                )
 
-            if order_data.order_items:
-                for item_data in order_data.order_items:
-                    db_order_item = OrderItem(
-                        order_id=db_order.id,
-                        product_name=item_data.product_name,
-                        order_qty=item_data.order_qty,
-                        file_url=item_data.file_url
-                    )
-                    self.db.add(db_order_item)
-            
+            delta.add_order_model(db_order)
+            await StatsService(self.db).apply(delta, user)
+            refs.add_items(db_order.order_items)
+            await UploadService(self.db).apply_refs(refs)
+
+            # Satu transaksi, flush hanya mengirim row yang berubah
+            await VersionService(self.db).touch(user, "orders")
             await self.db.commit()
-            await self.db.refresh(db_order)
             
             return db_order
             
@@ -241,6 +222,52 @@ class OrderService:
             await self.db.rollback()
             raise Exception(f"Error updating order: {e}")
 
+    def _reconcile_items(self, db_order: Order, items_data: List[OrderItemCreate]) -> List[OrderItem]:
+        """Samakan order_items dengan payload: yang sama dibiarkan, yang berubah di-update,
+        yang baru di-insert dan sisanya di-delete. Return item yang baru ditambahkan.
+        """
+        exact = defaultdict(list)
+        by_name = defaultdict(list)
+        for item in db_order.order_items:
+            exact[(item.product_name, item.order_qty, item.file_url)].append(item)
+            by_name[item.product_name].append(item)
+
+        # Item yang identik tidak disentuh sama sekali
+        pending = []
+        for item_data in items_data:
+            matches = exact.get((item_data.product_name, item_data.order_qty, item_data.file_url))
+            if matches:
+                by_name[item_data.product_name].remove(matches.pop())
+            else:
+                pending.append(item_data)
+
+        new_items = []
+        for item_data in pending:
+            matches = by_name.get(item_data.product_name)
+            if matches:
+                match = matches.pop()
+                exact[(match.product_name, match.order_qty, match.file_url)].remove(match)
+                if match.order_qty != item_data.order_qty:
+                    match.order_qty = item_data.order_qty
+                if match.file_url != item_data.file_url:
+                    match.file_url = item_data.file_url
+            else:
+                new_item = OrderItem(
+                    user_id=db_order.user_id,
+                    product_name=item_data.product_name,
+                    order_qty=item_data.order_qty,
+                    file_url=item_data.file_url
+                )
+                db_order.order_items.append(new_item)
+                new_items.append(new_item)
+
+        # delete-orphan menghapus item yang dikeluarkan dari collection
+        for items in by_name.values():
+            for item in items:
+                db_order.order_items.remove(item)
+
+        return new_items
+
     async def delete_order(self, order_id: uuid.UUID, user: TokenData) -> bool:
         try:
             # Get existing order
@@ -248,7 +275,15 @@ class OrderService:
             if not db_order:
                 return False
             
+            delta = StatsDelta()
+            delta.add_order_model(db_order, sign=-1)
+            await StatsService(self.db).apply(delta, user)
+            refs = FileRefs()
+            refs.add_items(db_order.order_items, sign=-1)
+            await UploadService(self.db).apply_refs(refs)
+
             await self.db.delete(db_order)
+            await VersionService(self.db).touch(user, "orders")
             await self.db.commit()
             
             return True
@@ -1,11 +1,22 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 import uuid
 
 from app.models.product_models import Product
 from app.schemas.product_schema import ProductCreate, ProductUpdate
 from app.schemas.sys_schema import TokenData
+from app.services.version_service import VersionService
+from app.utils.autocomplete import autocomplete_cache
+from app.utils.batches import chunked
+from app.utils.errors import ConflictError, is_unique_violation
+from app.utils.fields import Fields, load_only_fields
+from app.utils.pagination import Cursor
+
+PRODUCT_NAME_CONSTRAINT = "uq_products_user_id_lower_name"
 
 
 class ProductService:
@@ -21,27 +32,100 @@ class ProductService:
             )
             
             self.db.add(db_product)
+            autocomplete_cache.invalidate_on_commit(self.db, ("product", user.user_id))
+            await VersionService(self.db).touch(user, "products")
             await self.db.commit()
             await self.db.refresh(db_product)
             
             return db_product
             
+        except IntegrityError as e:
+            await self.db.rollback()
+            if is_unique_violation(e, PRODUCT_NAME_CONSTRAINT):
+                raise ConflictError(f"Product dengan nama '{product_data.name}' sudah ada")
+            raise Exception(f"Error creating product: {e}")
         except Exception as e:
             await self.db.rollback()
             raise Exception(f"Error creating product: {e}")
 
-    async def get_products(self, user: TokenData, skip: int = 0, limit: int = 100) -> List[Product]:
+    async def ensure_products(self, names: Iterable[str], user: TokenData) -> None:
+        """Insert produk yang belum ada (case-insensitive), tanpa commit.
+
+        Diurutkan berdasarkan lower(name) supaya create yang bersamaan dengan produk yang
+        beririsan mengunci index dengan urutan yang sama dan tidak deadlock. Satu
+        statement per chunk supaya import besar tidak melewati batas bind parameter.
+        """
+        unique_names = {}
+        for name in names:
+            unique_names.setdefault(name.lower(), name)
+        if not unique_names:
+            return
+
+        now = datetime.utcnow()
+        rows = [
+            {"id": uuid.uuid4(), "user_id": user.user_id, "name": name, "created_at": now}
+            for _, name in sorted(unique_names.items())
+        ]
+        inserted = 0
+        for chunk in chunked(rows, 4):
+            stmt = (
+                pg_insert(Product)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[Product.user_id, func.lower(Product.name)])
+            )
+            inserted += (await self.db.execute(stmt)).rowcount
+        if inserted:
+            autocomplete_cache.invalidate_on_commit(self.db, ("product", user.user_id))
+            await VersionService(self.db).touch(user, "products")
+
+    async def suggest_products(self, user: TokenData, q: str, limit: int = 10) -> List[dict]:
+        """Autocomplete nama product dari index di memory, DB hanya dipakai saat index belum ada"""
+        async def load():
+            result = await self.db.execute(
+                select(Product.id, Product.name, Product.description)
+                .where(Product.user_id == user.user_id)
+            )
+            return [(row["name"], dict(row)) for row in result.mappings()]
+
+        try:
+            index = await autocomplete_cache.get(("product", user.user_id), load)
+            return index.search(q, limit)
+
+        except Exception as e:
+            raise Exception(f"Error suggesting products: {e}")
+
+    async def get_products(
+        self,
+        user: TokenData,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None,
+        fields: Fields = None,
+    ) -> List[Product]:
         try:
-            query = select(Product).where(Product.user_id == user.user_id).offset(skip).limit(limit)
+            query = (
+                select(Product)
+                .where(Product.user_id == user.user_id)
+                .order_by(Product.created_at.desc(), Product.id.desc())
+                .limit(limit)
+            )
+            if fields:
+                query = query.options(load_only_fields(Product, fields, Product.created_at))
+            if cursor:
+                query = query.where(tuple_(Product.created_at, Product.id) < cursor)
+            else:
+                query = query.offset(skip)
             result = await self.db.execute(query)
             return result.scalars().all()
             
         except Exception as e:
             raise Exception(f"Error getting products: {e}")
 
-    async def get_product_by_id(self, product_id: uuid.UUID, user: TokenData) -> Optional[Product]:
+    async def get_product_by_id(self, product_id: uuid.UUID, user: TokenData, fields: Fields = None) -> Optional[Product]:
         try:
             query = select(Product).where(Product.id == product_id, Product.user_id == user.user_id)
+            if fields:
+                query = query.options(load_only_fields(Product, fields))
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
             
@@ -61,11 +145,18 @@ class ProductService:
             if product_data.description is not None:
                 db_product.description = product_data.description
             
+            autocomplete_cache.invalidate_on_commit(self.db, ("product", user.user_id))
+            await VersionService(self.db).touch(user, "products")
             await self.db.commit()
             await self.db.refresh(db_product)
             
             return db_product
             
+        except IntegrityError as e:
+            await self.db.rollback()
+            if is_unique_violation(e, PRODUCT_NAME_CONSTRAINT):
+                raise ConflictError(f"Product dengan nama '{product_data.name}' sudah ada")
+            raise Exception(f"Error updating product: {e}")
         except Exception as e:
             await self.db.rollback()
             raise Exception(f"Error updating product: {e}")
@@ -78,6 +169,8 @@ class ProductService:
                 return False
             
             await self.db.delete(db_product)
+            autocomplete_cache.invalidate_on_commit(self.db, ("product", user.user_id))
+            await VersionService(self.db).touch(user, "products")
             await self.db.commit()
             
             return True
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.report_models import ReportRefresh
+from app.models.report_views import REPORT_VIEWS, MonthlyOrderVolume, OverdueOrder, TopProduct
+from app.schemas.sys_schema import TokenData
+
+# Key advisory lock supaya dengan banyak worker hanya satu yang refresh
+REFRESH_LOCK_KEY = 7310013
+REFRESH_NAME = "report_views"
+
+
+async def refresh_report_views() -> bool:
+    """Refresh semua materialized view laporan, return False kalau dilewati.
+
+    Setiap worker menjadwalkan job ini, tapi hanya yang pertama di setiap interval yang
+    benar-benar refresh: worker lain melewati kalau lock sedang dipegang atau refresh
+    terakhir (report_refreshes) masih lebih baru dari interval dikurangi jitter.
+    """
+    async with engine.connect() as conn:
+        locked = (await conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": REFRESH_LOCK_KEY}
+        )).scalar()
+        await conn.commit()
+        if not locked:
+            return False
+
+        try:
+            refreshed_at = (await conn.execute(
+                select(ReportRefresh.refreshed_at).where(ReportRefresh.name == REFRESH_NAME)
+            )).scalar()
+            await conn.commit()
+            min_age = timedelta(
+                seconds=settings.REPORT_REFRESH_INTERVAL_SECONDS - settings.REPORT_REFRESH_JITTER_SECONDS
+            )
+            if refreshed_at is not None and datetime.utcnow() - refreshed_at < min_age:
+                return False
+
+            for view in REPORT_VIEWS:
+                # CONCURRENTLY supaya read ke view tidak terblokir selama refresh
+                await conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+                await conn.commit()
+
+            stmt = pg_insert(ReportRefresh).values(name=REFRESH_NAME, refreshed_at=datetime.utcnow())
+            await conn.execute(stmt.on_conflict_do_update(
+                index_elements=[ReportRefresh.name],
+                set_={"refreshed_at": stmt.excluded.refreshed_at}
+            ))
+            await conn.commit()
+            return True
+        except Exception as e:
+            await conn.rollback()
+            print(f"Error refresh report views: {e}")
+            return False
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": REFRESH_LOCK_KEY})
+            await conn.commit()
+
+
+class ReportService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_monthly_volumes(self, user: TokenData) -> List[dict]:
+        try:
+            query = (
+                select(MonthlyOrderVolume.c.month, MonthlyOrderVolume.c.order_count, MonthlyOrderVolume.c.total_qty)
+                .where(MonthlyOrderVolume.c.user_id == user.user_id)
+                .order_by(MonthlyOrderVolume.c.month)
+            )
+            result = await self.db.execute(query)
+            return [dict(row) for row in result.mappings()]
+
+        except Exception as e:
+            raise Exception(f"Error getting monthly volumes: {e}")
+
+    async def get_top_products(self, user: TokenData, limit: int = 20) -> List[dict]:
+        try:
+            query = (
+                select(TopProduct.c.product_name, TopProduct.c.total_qty, TopProduct.c.order_count)
+                .where(TopProduct.c.user_id == user.user_id)
+                .order_by(TopProduct.c.total_qty.desc())
+                .limit(limit)
+            )
+            result = await self.db.execute(query)
+            return [dict(row) for row in result.mappings()]
+
+        except Exception as e:
+            raise Exception(f"Error getting top products: {e}")
+
+    async def get_overdue_orders(self, user: TokenData, skip: int = 0, limit: int = 100) -> List[dict]:
+        try:
+            query = (
+                select(
+                    OverdueOrder.c.id,
+                    OverdueOrder.c.order_id,
+                    OverdueOrder.c.order_reference_number,
+                    OverdueOrder.c.name,
+                    OverdueOrder.c.due_date,
+                    OverdueOrder.c.item_count,
+                    OverdueOrder.c.total_qty,
+                )
+                .where(OverdueOrder.c.user_id == user.user_id)
+                .order_by(OverdueOrder.c.due_date)
+                .offset(skip)
+                .limit(limit)
+            )
+            result = await self.db.execute(query)
+            return [dict(row) for row in result.mappings()]
+
+        except Exception as e:
+            raise Exception(f"Error getting overdue orders: {e}")
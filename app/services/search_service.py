@@ -0,0 +1,93 @@
+from typing import List, Optional, Sequence
+
+from sqlalchemy import cast, func, literal_column, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.customer_models import Customer
+from app.models.order_models import Order, OrderItem
+from app.models.product_models import Product
+from app.schemas.sys_schema import TokenData
+from app.utils.pagination import RankCursor
+
+SEARCH_TYPES = ("order", "customer", "product")
+
+
+class SearchService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(
+        self,
+        user: TokenData,
+        q: str,
+        types: Sequence[str] = SEARCH_TYPES,
+        limit: int = 20,
+        cursor: Optional[RankCursor] = None,
+    ) -> List[dict]:
+        try:
+            tsquery = func.websearch_to_tsquery(cast("simple", REGCONFIG), q)
+            parts = []
+
+            if "order" in types:
+                # Order cocok lewat kolomnya sendiri atau lewat product_name salah satu item
+                order_hits = (
+                    select(Order.id.label("id"), func.ts_rank(Order.search_vector, tsquery).label("rank"))
+                    .where(Order.user_id == user.user_id, Order.search_vector.bool_op("@@")(tsquery))
+                )
+                # order_items.user_id ikut di GIN index, jadi item user lain tidak ikut di-scan
+                item_hits = (
+                    select(OrderItem.order_id.label("id"), func.ts_rank(OrderItem.search_vector, tsquery).label("rank"))
+                    .where(OrderItem.user_id == user.user_id, OrderItem.search_vector.bool_op("@@")(tsquery))
+                )
+                matched = union_all(order_hits, item_hits).subquery()
+                parts.append(
+                    select(
+                        literal_column("'order'").label("type"),
+                        Order.id.label("id"),
+                        func.coalesce(Order.order_id, Order.order_reference_number).label("title"),
+                        Order.name.label("subtitle"),
+                        func.max(matched.c.rank).label("rank"),
+                    )
+                    .join(Order, Order.id == matched.c.id)
+                    .group_by(Order.id)
+                )
+
+            if "customer" in types:
+                parts.append(
+                    select(
+                        literal_column("'customer'").label("type"),
+                        Customer.id.label("id"),
+                        Customer.name.label("title"),
+                        Customer.address.label("subtitle"),
+                        func.ts_rank(Customer.search_vector, tsquery).label("rank"),
+                    )
+                    .where(Customer.user_id == user.user_id, Customer.search_vector.bool_op("@@")(tsquery))
+                )
+
+            if "product" in types:
+                parts.append(
+                    select(
+                        literal_column("'product'").label("type"),
+                        Product.id.label("id"),
+                        Product.name.label("title"),
+                        Product.description.label("subtitle"),
+                        func.ts_rank(Product.search_vector, tsquery).label("rank"),
+                    )
+                    .where(Product.user_id == user.user_id, Product.search_vector.bool_op("@@")(tsquery))
+                )
+
+            hits = union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+            query = (
+                select(hits)
+                .order_by(hits.c.rank.desc(), hits.c.id.desc())
+                .limit(limit)
+            )
+            if cursor:
+                query = query.where(tuple_(hits.c.rank, hits.c.id) < cursor)
+
+            result = await self.db.execute(query)
+            return [dict(row) for row in result.mappings()]
+
+        except Exception as e:
+            raise Exception(f"Error searching: {e}")
@@ -0,0 +1,145 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.stats_models import LocationStat, OrderDailyStat, ProductQuantityStat
+from app.schemas.sys_schema import TokenData
+from app.utils.batches import chunked
+
+
+class StatsDelta:
+    """Kumpulan perubahan counter dari satu atau beberapa order.
+
+    Order lama ditambahkan dengan sign=-1 dan order baru dengan sign=1, sehingga
+    update yang tidak mengubah apa pun menghasilkan delta nol dan tidak menulis apa-apa.
+    """
+
+    def __init__(self):
+        self.days = defaultdict(int)
+        self.products = defaultdict(int)
+        self.product_names = {}
+        self.locations = defaultdict(int)
+
+    def add_order(
+        self,
+        issues_date: datetime,
+        state: Optional[str],
+        suburb: Optional[str],
+        items: Iterable[Tuple[str, int]],
+        sign: int = 1,
+    ) -> None:
+        self.days[issues_date.date()] += sign
+        self.locations[(state or "", suburb or "")] += sign
+        for product_name, order_qty in items:
+            key = product_name.lower()
+            self.products[key] += sign * order_qty
+            self.product_names.setdefault(key, product_name)
+
+    def add_order_model(self, order, sign: int = 1) -> None:
+        """Tambahkan Order ORM (order_items harus sudah di-load) atau schema OrderCreate"""
+        self.add_order(
+            order.issues_date,
+            order.state,
+            order.suburb,
+            ((item.product_name, item.order_qty) for item in order.order_items),
+            sign,
+        )
+
+
+class StatsService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def apply(self, delta: StatsDelta, user: TokenData) -> None:
+        """Terapkan delta dengan upsert increment, tanpa commit.
+
+        Row diurutkan berdasarkan conflict key supaya dua transaksi yang menyentuh row
+        yang sama mengunci dengan urutan yang sama dan tidak deadlock. Satu statement per
+        chunk supaya import besar tidak melewati batas bind parameter.
+        """
+        days = sorted((day, count) for day, count in delta.days.items() if count)
+        for chunk in chunked(days, 3):
+            stmt = pg_insert(OrderDailyStat).values([
+                {"user_id": user.user_id, "day": day, "order_count": count} for day, count in chunk
+            ])
+            await self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[OrderDailyStat.user_id, OrderDailyStat.day],
+                set_={"order_count": OrderDailyStat.order_count + stmt.excluded.order_count}
+            ))
+
+        products = sorted((key, qty) for key, qty in delta.products.items() if qty)
+        for chunk in chunked(products, 4):
+            stmt = pg_insert(ProductQuantityStat).values([
+                {
+                    "user_id": user.user_id,
+                    "product_key": key,
+                    "product_name": delta.product_names[key],
+                    "total_qty": qty,
+                }
+                for key, qty in chunk
+            ])
+            await self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[ProductQuantityStat.user_id, ProductQuantityStat.product_key],
+                set_={"total_qty": ProductQuantityStat.total_qty + stmt.excluded.total_qty}
+            ))
+
+        locations = sorted((location, count) for location, count in delta.locations.items() if count)
+        for chunk in chunked(locations, 4):
+            stmt = pg_insert(LocationStat).values([
+                {"user_id": user.user_id, "state": state, "suburb": suburb, "order_count": count}
+                for (state, suburb), count in chunk
+            ])
+            await self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[LocationStat.user_id, LocationStat.state, LocationStat.suburb],
+                set_={"order_count": LocationStat.order_count + stmt.excluded.order_count}
+            ))
+
+    async def get_stats(
+        self,
+        user: TokenData,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> dict:
+        try:
+            days_query = (
+                select(OrderDailyStat.day, OrderDailyStat.order_count)
+                .where(OrderDailyStat.user_id == user.user_id, OrderDailyStat.order_count > 0)
+                .order_by(OrderDailyStat.day)
+            )
+            if date_from:
+                days_query = days_query.where(OrderDailyStat.day >= date_from)
+            if date_to:
+                days_query = days_query.where(OrderDailyStat.day <= date_to)
+
+            products_query = (
+                select(ProductQuantityStat.product_name, ProductQuantityStat.total_qty)
+                .where(ProductQuantityStat.user_id == user.user_id, ProductQuantityStat.total_qty > 0)
+                .order_by(ProductQuantityStat.total_qty.desc())
+            )
+            locations_query = (
+                select(LocationStat.state, LocationStat.suburb, LocationStat.order_count)
+                .where(LocationStat.user_id == user.user_id, LocationStat.order_count > 0)
+                .order_by(LocationStat.order_count.desc())
+            )
+
+            days = (await self.db.execute(days_query)).all()
+            products = (await self.db.execute(products_query)).all()
+            locations = (await self.db.execute(locations_query)).all()
+
+            return {
+                "orders_per_day": [{"day": day, "order_count": count} for day, count in days],
+                "product_quantities": [
+                    {"product_name": name, "total_qty": qty} for name, qty in products
+                ],
+                "locations": [
+                    {"state": state or None, "suburb": suburb or None, "order_count": count}
+                    for state, suburb, count in locations
+                ],
+            }
+
+        except Exception as e:
+            raise Exception(f"Error getting stats: {e}")
@@ -0,0 +1,75 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.models.token_models import RevokedToken
+from app.utils.revocation import revocation_list
+
+# Sync incremental membaca ulang sebagian row terakhir, menutup selisih jam antar worker
+# dan transaksi yang commit setelah watermark terbaca
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class TokenService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def revoke(self, jti: uuid.UUID, user_id: uuid.UUID, expires_at: datetime) -> bool:
+        """Catat jti sebagai dicabut tanpa commit, False kalau sudah pernah dicabut"""
+        result = await self.db.execute(
+            pg_insert(RevokedToken)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at, revoked_at=datetime.utcnow())
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+            .returning(RevokedToken.jti)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def is_revoked(self, jti: uuid.UUID) -> bool:
+        result = await self.db.execute(select(RevokedToken.jti).where(RevokedToken.jti == jti))
+        return result.scalar_one_or_none() is not None
+
+
+async def is_token_revoked(jti: Optional[uuid.UUID]) -> bool:
+    """Cek revocation untuk get_current_user, DB hanya disentuh kalau Bloom filter positif"""
+    if jti is None or not revocation_list.might_be_revoked(jti):
+        return False
+    confirmed = revocation_list.confirmed(jti)
+    if confirmed is not None:
+        return confirmed
+    version = revocation_list.version
+    async with async_session() as session:
+        revoked = await TokenService(session).is_revoked(jti)
+    revocation_list.confirm(jti, revoked, version)
+    return revoked
+
+
+async def sync_revocations(full: bool = False) -> None:
+    """Tarik jti yang dicabut worker lain ke Bloom filter lokal.
+
+    Full rebuild membuang jti yang sudah expired dari filter dan menghapus row-nya.
+    """
+    try:
+        async with async_session() as session:
+            now = datetime.utcnow()
+            query = select(RevokedToken.jti, RevokedToken.revoked_at).where(RevokedToken.expires_at > now)
+            rebuild = full or revocation_list.synced_until is None
+            if not rebuild:
+                query = query.where(RevokedToken.revoked_at > revocation_list.synced_until - SYNC_OVERLAP)
+            rows = (await session.execute(query)).all()
+
+            synced_until = max((revoked_at for _, revoked_at in rows), default=revocation_list.synced_until or now)
+            if rebuild:
+                revocation_list.rebuild((jti for jti, _ in rows), synced_until)
+                await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+                await session.commit()
+            else:
+                for jti, _ in rows:
+                    revocation_list.add(jti)
+                revocation_list.synced_until = max(synced_until, revocation_list.synced_until)
+    except Exception as e:
+        print(f"Error sync revocations: {e}")
@@ -0,0 +1,183 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import bindparam, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import async_session, engine
+from app.models.upload_models import UploadObject
+from app.schemas.sys_schema import TokenData
+from app.utils.batches import chunked
+from app.utils.uploads import (
+    file_extension,
+    hash_file,
+    remove_stale_tmp,
+    remove_upload,
+    store_upload,
+    upload_key,
+    upload_url_key,
+)
+
+# Key advisory lock supaya dengan banyak worker hanya satu yang menjalankan GC
+GC_LOCK_KEY = 7310025
+
+
+class FileRefs:
+    """Selisih referensi order_items.file_url ke file upload, per key.
+
+    Item lama ditambahkan dengan sign=-1 dan item baru dengan sign=1, seperti StatsDelta.
+    """
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+
+    def add_items(self, items: Iterable, sign: int = 1) -> None:
+        """Tambahkan OrderItem ORM atau schema OrderItemCreate"""
+        for item in items:
+            key = upload_url_key(item.file_url)
+            if key:
+                self.counts[key] += sign
+
+
+class UploadService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _lock_keys(self, keys: List[str]) -> None:
+        """Lock per key sampai transaksi selesai, upload, referensi dan GC untuk key yang sama antre.
+
+        Semua key dikunci dalam satu statement dengan urutan tetap supaya tidak deadlock.
+        """
+        await self.db.execute(
+            text(
+                "SELECT pg_advisory_xact_lock(hashtextextended(k, 0)) "
+                "FROM unnest(CAST(:keys AS text[])) AS k ORDER BY k"
+            ),
+            {"keys": keys},
+        )
+
+    async def save(self, file: UploadFile, user: TokenData) -> dict:
+        """Simpan upload, isi yang sudah ada di disk tidak ditulis ulang.
+
+        Hash dihitung dulu dari file sementara milik Starlette (hanya baca), jadi isi yang
+        sama terdeteksi sebelum ada byte yang ditulis ke folder upload. Response sama
+        persis untuk file baru maupun duplikat, supaya tidak bocor apakah user lain
+        pernah meng-upload isi yang sama.
+        """
+        try:
+            extension = file_extension(file.filename)
+            await file.seek(0)
+            size, sha256 = await run_in_threadpool(hash_file, file.file, settings.UPLOAD_MAX_BYTES)
+            key = upload_key(user.user_id, sha256)
+
+            await self._lock_keys([key])
+            stmt = pg_insert(UploadObject).values(key=key, sha256=sha256, size=size, ref_count=0)
+            await self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[UploadObject.key],
+                # Upload ulang memperpanjang grace period file yang belum direferensikan,
+                # sha256 dan size diisi untuk row yang dibuat apply_refs sebelum upload
+                set_={"sha256": sha256, "size": size, "last_uploaded_at": datetime.utcnow()}
+            ))
+            same_content = (await self.db.execute(
+                select(UploadObject.key)
+                .where(UploadObject.sha256 == sha256, UploadObject.key != key)
+                .limit(5)
+            )).scalars().all()
+
+            await file.seek(0)
+            path = await run_in_threadpool(store_upload, file.file, key, extension, sha256, same_content)
+            await self.db.commit()
+            return {"url": path, "size": size, "sha256": sha256}
+
+        except HTTPException:
+            await self.db.rollback()
+            raise
+        except Exception as e:
+            await self.db.rollback()
+            raise Exception(f"Error saving upload: {e}")
+
+    async def apply_refs(self, refs: FileRefs) -> None:
+        """Terapkan FileRefs ke ref_count, tanpa commit.
+
+        Increment di-upsert supaya file_url yang dipakai sebelum file-nya di-upload
+        tetap terhitung. Decrement tidak pernah membuat ref_count negatif. Diurutkan
+        supaya dua transaksi yang menyentuh key yang sama tidak deadlock.
+        """
+        counts = sorted((key, count) for key, count in refs.counts.items() if count)
+        increments = [(key, count) for key, count in counts if count > 0]
+        decrements = [(key, count) for key, count in counts if count < 0]
+
+        if increments:
+            # Lock yang sama dengan GC, file yang sedang dihapus tidak bisa direferensikan ulang
+            await self._lock_keys([key for key, _ in increments])
+            for chunk in chunked(increments, 3):
+                stmt = pg_insert(UploadObject).values([
+                    {"key": key, "size": 0, "ref_count": count} for key, count in chunk
+                ])
+                await self.db.execute(stmt.on_conflict_do_update(
+                    index_elements=[UploadObject.key],
+                    set_={"ref_count": UploadObject.ref_count + stmt.excluded.ref_count}
+                ))
+
+        if decrements:
+            table = UploadObject.__table__
+            await self.db.execute(
+                table.update()
+                .where(table.c.key == bindparam("b_key"))
+                .values(ref_count=func.greatest(table.c.ref_count + bindparam("b_delta"), 0)),
+                [{"b_key": key, "b_delta": count} for key, count in decrements],
+            )
+
+
+async def collect_unreferenced_uploads() -> int:
+    """Hapus file tanpa referensi yang lebih tua dari grace period, return jumlah file.
+
+    Return 0 kalau worker lain sedang menjalankan GC.
+    """
+    async with engine.connect() as conn:
+        locked = (await conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": GC_LOCK_KEY}
+        )).scalar()
+        await conn.commit()
+        if not locked:
+            return 0
+
+        collected = 0
+        try:
+            grace = timedelta(seconds=settings.UPLOAD_GC_GRACE_SECONDS)
+            cutoff = datetime.utcnow() - grace
+            unreferenced = (UploadObject.ref_count <= 0, UploadObject.last_uploaded_at < cutoff)
+
+            async with async_session() as session:
+                candidates = (await session.execute(
+                    select(UploadObject.key).where(*unreferenced).limit(settings.UPLOAD_GC_BATCH_SIZE)
+                )).scalars().all()
+
+            for key in candidates:
+                # Satu transaksi per file, kondisi dicek ulang setelah lock karena bisa saja
+                # direferensikan atau di-upload ulang sejak candidates dibaca
+                async with async_session() as session:
+                    await UploadService(session)._lock_keys([key])
+                    deleted = (await session.execute(
+                        delete(UploadObject)
+                        .where(UploadObject.key == key, *unreferenced)
+                        .returning(UploadObject.key)
+                    )).scalar_one_or_none()
+                    if deleted:
+                        await run_in_threadpool(remove_upload, key)
+                        collected += 1
+                    await session.commit()
+
+            await run_in_threadpool(remove_stale_tmp, grace.total_seconds())
+            return collected
+        except Exception as e:
+            print(f"Error collect uploads: {e}")
+            return collected
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": GC_LOCK_KEY})
+            await conn.commit()
@@ -0,0 +1,34 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.version_models import ResourceVersion
+from app.schemas.sys_schema import TokenData
+from app.utils.response_cache import response_cache
+
+# Resource yang punya versi, sama dengan nama router
+RESOURCES = ("orders", "products", "customers")
+
+
+class VersionService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def touch(self, user: TokenData, resource: str) -> None:
+        """Naikkan versi resource di transaksi yang sedang berjalan, tanpa commit.
+
+        Response cache untuk resource tersebut ikut di-invalidate setelah commit.
+        """
+        stmt = pg_insert(ResourceVersion).values(user_id=user.user_id, resource=resource, version=1)
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[ResourceVersion.user_id, ResourceVersion.resource],
+            set_={"version": ResourceVersion.version + 1}
+        ))
+        response_cache.invalidate_on_commit(self.db, user.user_id, resource)
+
+    async def get_version(self, user: TokenData, resource: str) -> int:
+        result = await self.db.execute(
+            select(ResourceVersion.version)
+            .where(ResourceVersion.user_id == user.user_id, ResourceVersion.resource == resource)
+        )
+        return result.scalar_one_or_none() or 0
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.utils.commit_hooks import invalidate_on_commit, register_invalidation
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+class PrefixIndex:
+    """List terurut (key, entry), prefix lookup pakai bisect"""
+
+    def __init__(self, entries: Iterable[Tuple[str, dict]]):
+        pairs = sorted(((normalize(name), entry) for name, entry in entries), key=lambda pair: pair[0])
+        self.keys = [key for key, _ in pairs]
+        self.entries = [entry for _, entry in pairs]
+
+    def search(self, prefix: str, limit: int) -> List[dict]:
+        prefix = normalize(prefix)
+        start = bisect_left(self.keys, prefix)
+        results = []
+        for i in range(start, len(self.keys)):
+            if len(results) >= limit or not self.keys[i].startswith(prefix):
+                break
+            results.append(self.entries[i])
+        return results
+
+
+class AutocompleteCache:
+    """LRU index per (jenis, user_id), di-load saat pertama dipakai.
+
+    Cache ini per proses: write di worker lain baru terlihat setelah TTL habis. Seperti
+    ResponseCache, invalidation menaikkan generation key, index yang load-nya dimulai
+    sebelum invalidation dikembalikan ke pemanggil tapi tidak disimpan.
+    """
+
+    def __init__(self, max_users: int, ttl_seconds: float):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._indexes: "OrderedDict[Hashable, Tuple[float, PrefixIndex]]" = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._generations: Dict[Hashable, int] = {}
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Iterable[Tuple[str, dict]]]]) -> PrefixIndex:
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        # Satu loader per key, request lain menunggu hasil yang sama
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                cached = self._lookup(key)
+                if cached is not None:
+                    return cached
+                generation = self._generations.get(key, 0)
+                index = PrefixIndex(await loader())
+                if self._generations.get(key, 0) == generation:
+                    self._store(key, index)
+                return index
+        finally:
+            # Lock hanya perlu selama load, tidak disimpan untuk key yang sudah selesai
+            if not lock.locked() and self._locks.get(key) is lock:
+                del self._locks[key]
+
+    def _store(self, key: Hashable, index: PrefixIndex) -> None:
+        self._indexes[key] = (time.monotonic(), index)
+        self._indexes.move_to_end(key)
+        while len(self._indexes) > self.max_users:
+            self._indexes.popitem(last=False)
+
+    def _lookup(self, key: Hashable):
+        cached = self._indexes.get(key)
+        if cached is None:
+            return None
+        loaded_at, index = cached
+        if time.monotonic() - loaded_at > self.ttl_seconds:
+            del self._indexes[key]
+            return None
+        self._indexes.move_to_end(key)
+        return index
+
+    def invalidate(self, key: Hashable) -> None:
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._indexes.pop(key, None)
+
+    def invalidate_on_commit(self, db: AsyncSession, key: Hashable) -> None:
+        invalidate_on_commit(db, "autocomplete", key)
+
+
+autocomplete_cache = AutocompleteCache(settings.AUTOCOMPLETE_MAX_USERS, settings.AUTOCOMPLETE_TTL_SECONDS)
+
+register_invalidation("autocomplete", autocomplete_cache.invalidate)
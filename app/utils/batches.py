@@ -0,0 +1,17 @@
+from typing import Iterator, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# Batas bind parameter per statement di protokol Postgres (asyncpg menolak lebih dari ini)
+MAX_BIND_PARAMS = 32767
+
+
+def chunked(rows: Sequence[T], params_per_row: int) -> Iterator[Sequence[T]]:
+    """Pecah rows untuk multi-row VALUES supaya satu statement tidak melewati MAX_BIND_PARAMS.
+
+    Urutan rows dipertahankan, jadi rows yang sudah diurutkan untuk menghindari
+    deadlock tetap mengunci dengan urutan yang sama.
+    """
+    size = max(1, MAX_BIND_PARAMS // params_per_row)
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
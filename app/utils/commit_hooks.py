@@ -0,0 +1,30 @@
+from typing import Callable, Dict, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# (nama cache, key) yang di-invalidate setelah transaksi session commit
+PENDING_KEY = "invalidate_on_commit"
+
+_handlers: Dict[str, Callable[[Hashable], None]] = {}
+
+
+def register_invalidation(name: str, handler: Callable[[Hashable], None]) -> None:
+    _handlers[name] = handler
+
+
+def invalidate_on_commit(db: AsyncSession, name: str, key: Hashable) -> None:
+    """Invalidate setelah transaksi commit supaya reload tidak membaca data lama"""
+    db.info.setdefault(PENDING_KEY, set()).add((name, key))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    for name, key in session.info.pop(PENDING_KEY, ()):
+        _handlers[name](key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
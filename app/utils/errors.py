@@ -0,0 +1,14 @@
+from sqlalchemy.exc import IntegrityError
+
+
+class ConflictError(Exception):
+    """Data bentrok dengan unique constraint, dijawab router dengan 409"""
+
+
+class BadRequestError(Exception):
+    """Parameter request tidak valid, dijawab 400 dengan format BaseResponse oleh handler di main"""
+
+
+def is_unique_violation(error: IntegrityError, constraint: str) -> bool:
+    """Cek apakah IntegrityError berasal dari unique index/constraint tertentu"""
+    return constraint in str(error.orig)
@@ -0,0 +1,44 @@
+from functools import lru_cache
+from typing import Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+from app.utils.errors import BadRequestError
+
+# Nama field response yang diminta lewat ?fields=, None berarti semua field
+Fields = Optional[Tuple[str, ...]]
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Fields:
+    """Parse 'a,b' menjadi field response model, urut sesuai definisi model"""
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        raise BadRequestError("fields tidak boleh kosong")
+    unknown = requested - model.model_fields.keys()
+    if unknown:
+        raise BadRequestError(f"Field tidak dikenal: {', '.join(sorted(unknown))}")
+    return tuple(name for name in model.model_fields if name in requested)
+
+
+# Kombinasi field dipilih client, cache dibatasi supaya model yang dibuat tidak menumpuk
+@lru_cache(maxsize=256)
+def sparse_model(model: Type[BaseModel], fields: Fields) -> Type[BaseModel]:
+    """Response model yang hanya berisi field yang diminta"""
+    if fields is None:
+        return model
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields},
+    )
+
+
+def load_only_fields(entity, fields: Tuple[str, ...], *always):
+    """load_only untuk kolom yang diminta, kolom lain raise kalau diakses"""
+    columns = inspect(entity).column_attrs.keys()
+    attributes = [getattr(entity, name) for name in fields if name in columns]
+    return load_only(*attributes, *always, raiseload=True)
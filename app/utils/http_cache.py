@@ -0,0 +1,93 @@
+import hashlib
+from typing import Hashable, Optional
+
+from fastapi import Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.sys_schema import TokenData
+from app.services.version_service import VersionService
+from app.utils.response_cache import Scope, response_cache
+from app.utils.responses import JSONBytesResponse
+from app.utils.sys import get_current_user, get_read_db
+
+
+def make_etag(scope: Scope, key: Hashable, version: int) -> str:
+    digest = hashlib.sha1(repr((scope, key)).encode()).hexdigest()[:16]
+    return f'"{scope[1]}-{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Perbandingan weak sesuai If-None-Match (prefix W/ diabaikan)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/")
+        # ETag dari response terkompresi diberi suffix encoding oleh CompressionMiddleware
+        for suffix in ('-gzip"', '-br"'):
+            if tag.endswith(suffix):
+                tag = tag[:-len(suffix)] + '"'
+        if tag == etag:
+            return True
+    return False
+
+
+class CachedResponse:
+    """Hasil lookup untuk satu request, dipakai handler lewat dependency cached_response.
+
+    `response` berisi 304 kalau ETag client masih sama, atau body dari cache kalau ada.
+    """
+
+    def __init__(self, scope: Scope, key: Hashable, generation: int, etag: str, response: Optional[Response]):
+        self.scope = scope
+        self.key = key
+        self.generation = generation
+        self.etag = etag
+        self.response = response
+
+    def store(self, body: bytes) -> Response:
+        response_cache.store(self.scope, self.key, (body, self.etag), self.generation)
+        return json_response(body, self.etag, "MISS")
+
+
+def json_response(body: bytes, etag: str, cache_status: str) -> Response:
+    return JSONBytesResponse(
+        content=body,
+        headers={"ETag": etag, "X-Cache": cache_status},
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def cached_response(resource: str):
+    """Dependency: cek cache dan ETag sebelum handler memuat row apa pun.
+
+    ETag diturunkan dari versi resource per user yang selalu dibaca dari DB (satu lookup
+    primary key), jadi write dari worker lain langsung membuat entry cache lokal basi.
+    """
+
+    async def dependency(
+        request: Request,
+        db: AsyncSession = Depends(get_read_db),
+        user: TokenData = Depends(get_current_user)
+    ) -> CachedResponse:
+        scope = (str(user.user_id), resource)
+        key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+        if_none_match = request.headers.get("if-none-match")
+
+        # Versi dibaca sebelum row, paling buruk ETag lebih lama dari data dan client memuat ulang
+        entry, generation = response_cache.lookup(scope, key)
+        version = await VersionService(db).get_version(user, resource)
+        etag = make_etag(scope, key, version)
+        if etag_matches(if_none_match, etag):
+            return CachedResponse(scope, key, generation, etag, not_modified(etag))
+
+        # ETag entry memuat versi saat disimpan, beda berarti ada write setelahnya
+        if entry is not None and entry[1] == etag:
+            return CachedResponse(scope, key, generation, etag, json_response(entry[0], etag, "HIT"))
+        return CachedResponse(scope, key, generation, etag, None)
+
+    return dependency
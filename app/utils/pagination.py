@@ -0,0 +1,57 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from app.utils.errors import BadRequestError
+
+Cursor = Tuple[datetime, uuid.UUID]
+RankCursor = Tuple[float, uuid.UUID]
+
+def _encode(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    return _encode({"c": created_at.isoformat(), "i": str(id)})
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """Decode cursor dari query param, cursor yang rusak dijawab 400"""
+    if not cursor:
+        return None
+    try:
+        data = _decode(cursor)
+        return datetime.fromisoformat(data["c"]), uuid.UUID(data["i"])
+    except Exception:
+        raise BadRequestError("cursor tidak valid")
+
+def encode_rank_cursor(rank: float, id: uuid.UUID) -> str:
+    return _encode({"r": rank, "i": str(id)})
+
+def decode_rank_cursor(cursor: Optional[str]) -> Optional[RankCursor]:
+    """Cursor untuk hasil yang diurutkan berdasarkan rank (search)"""
+    if not cursor:
+        return None
+    try:
+        data = _decode(cursor)
+        return float(data["r"]), uuid.UUID(data["i"])
+    except Exception:
+        raise BadRequestError("cursor tidak valid")
+
+def next_cursor(rows: Sequence, limit: int) -> Optional[str]:
+    """Cursor halaman berikutnya, None kalau halaman ini sudah yang terakhir"""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
+
+def next_rank_cursor(rows: Sequence[dict], limit: int) -> Optional[str]:
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_rank_cursor(last["rank"], last["id"])
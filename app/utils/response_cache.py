@@ -0,0 +1,161 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.utils.commit_hooks import invalidate_on_commit, register_invalidation
+
+# (user_id, resource), resource sama dengan nama router: "orders", "products", "customers"
+Scope = Tuple[str, str]
+# (body JSON, ETag)
+Entry = Tuple[bytes, str]
+
+
+class ResponseCacheBackend(ABC):
+    """Interface backend cache, value berupa body JSON yang sudah di-encode beserta ETag-nya"""
+
+    @abstractmethod
+    def get(self, scope: Scope, key: Hashable) -> Optional[Entry]: ...
+
+    @abstractmethod
+    def set(self, scope: Scope, key: Hashable, entry: Entry) -> None: ...
+
+    @abstractmethod
+    def invalidate(self, scope: Scope) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> dict: ...
+
+
+class NullResponseCache(ResponseCacheBackend):
+    def get(self, scope: Scope, key: Hashable) -> Optional[Entry]:
+        return None
+
+    def set(self, scope: Scope, key: Hashable, entry: Entry) -> None:
+        pass
+
+    def invalidate(self, scope: Scope) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "none"}
+
+
+class MemoryResponseCache(ResponseCacheBackend):
+    """LRU + TTL di memory proses, dibatasi total ukuran body"""
+
+    def __init__(self, ttl_seconds: float, max_bytes: int, max_entry_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[Tuple[Scope, Hashable], Tuple[float, Entry]]" = OrderedDict()
+        self._scopes: Dict[Scope, Set[Hashable]] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, scope: Scope, key: Hashable) -> Optional[Entry]:
+        cached = self._entries.get((scope, key))
+        if cached is None:
+            self.misses += 1
+            return None
+        stored_at, entry = cached
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            self._remove(scope, key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end((scope, key))
+        self.hits += 1
+        return entry
+
+    def set(self, scope: Scope, key: Hashable, entry: Entry) -> None:
+        size = len(entry[0])
+        if size > self.max_entry_bytes:
+            return
+        self._remove(scope, key)
+        self._entries[(scope, key)] = (time.monotonic(), entry)
+        self._scopes.setdefault(scope, set()).add(key)
+        self.size += size
+        while self.size > self.max_bytes:
+            (evicted_scope, evicted_key), _ = next(iter(self._entries.items()))
+            self._remove(evicted_scope, evicted_key)
+            self.evictions += 1
+
+    def invalidate(self, scope: Scope) -> None:
+        keys = self._scopes.pop(scope, ())
+        for key in keys:
+            _, (body, _) = self._entries.pop((scope, key))
+            self.size -= len(body)
+        self.invalidations += 1
+
+    def _remove(self, scope: Scope, key: Hashable) -> None:
+        cached = self._entries.pop((scope, key), None)
+        if cached is None:
+            return
+        self.size -= len(cached[1][0])
+        keys = self._scopes.get(scope)
+        keys.discard(key)
+        if not keys:
+            del self._scopes[scope]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class ResponseCache:
+    """Cache response GET per (user_id, route, params) dengan invalidation dari service.
+
+    Setiap invalidation menaikkan generation scope, response yang query-nya dimulai
+    sebelum invalidation tidak disimpan supaya data lama tidak masuk lagi ke cache.
+    Cache ini per proses; write di worker lain terdeteksi lewat versi di ETag entry
+    (lihat http_cache.cached_response), invalidation lokal hanya membebaskan memory lebih awal.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend):
+        self.backend = backend
+        self._generations: Dict[Scope, int] = {}
+
+    def lookup(self, scope: Scope, key: Hashable) -> Tuple[Optional[Entry], int]:
+        return self.backend.get(scope, key), self._generations.get(scope, 0)
+
+    def store(self, scope: Scope, key: Hashable, entry: Entry, generation: int) -> None:
+        if self._generations.get(scope, 0) == generation:
+            self.backend.set(scope, key, entry)
+
+    def invalidate(self, scope: Scope) -> None:
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+        self.backend.invalidate(scope)
+
+    def invalidate_on_commit(self, db: AsyncSession, user_id, resource: str) -> None:
+        invalidate_on_commit(db, "response", (str(user_id), resource))
+
+
+def _create_backend() -> ResponseCacheBackend:
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryResponseCache(
+            settings.RESPONSE_CACHE_TTL_SECONDS,
+            settings.RESPONSE_CACHE_MAX_BYTES,
+            settings.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+        )
+    return NullResponseCache()
+
+
+response_cache = ResponseCache(_create_backend())
+
+register_invalidation("response", response_cache.invalidate)
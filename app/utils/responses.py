@@ -0,0 +1,26 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+# Dibatasi karena response_type ikut berisi sparse_model dari ?fields=
+@lru_cache(maxsize=256)
+def response_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def render(response_type: Any, **content) -> bytes:
+    """Validasi sekali langsung dari objek ORM lalu encode ke bytes JSON.
+
+    Handler yang mengembalikan Response tidak divalidasi ulang oleh FastAPI terhadap
+    response_model, jadi setiap row hanya dikonversi satu kali.
+    """
+    adapter = response_adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+class JSONBytesResponse(Response):
+    """Response untuk body yang sudah berupa bytes JSON dari render()"""
+    media_type = "application/json"
@@ -0,0 +1,88 @@
+import hashlib
+import math
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, Optional
+
+from app.core.config import settings
+
+
+class BloomFilter:
+    """Bloom filter sederhana di atas bytearray, posisi bit dari double hashing blake2b"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: bytes):
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: bytes) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """Filter jti yang dicabut, disinkronkan dari tabel revoked_tokens.
+
+    Hasil negatif pasti benar sehingga request normal tidak perlu ke DB. Hasil positif
+    bisa false positive dan harus dikonfirmasi ke DB oleh pemanggil.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, max_confirmed: int = 10000):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.count = 0
+        # Naik setiap isi filter berubah, konfirmasi yang dimulai sebelumnya dibuang
+        self.version = 0
+        # revoked_at terbaru yang sudah masuk filter, None berarti belum pernah sync
+        self.synced_until: Optional[datetime] = None
+        # Hasil konfirmasi DB untuk jti yang positif di filter, supaya false positive
+        # tidak membuat setiap request token yang sama ke DB
+        self.max_confirmed = max_confirmed
+        self._confirmed: "OrderedDict[uuid.UUID, bool]" = OrderedDict()
+
+    def add(self, jti: uuid.UUID) -> None:
+        self.bloom.add(jti.bytes)
+        self.count += 1
+        self.version += 1
+        self._confirmed.pop(jti, None)
+
+    def might_be_revoked(self, jti: uuid.UUID) -> bool:
+        return self.count > 0 and jti.bytes in self.bloom
+
+    def confirmed(self, jti: uuid.UUID) -> Optional[bool]:
+        return self._confirmed.get(jti)
+
+    def confirm(self, jti: uuid.UUID, revoked: bool, version: int) -> None:
+        if version != self.version:
+            return
+        self._confirmed[jti] = revoked
+        self._confirmed.move_to_end(jti)
+        while len(self._confirmed) > self.max_confirmed:
+            self._confirmed.popitem(last=False)
+
+    def rebuild(self, jtis: Iterable[uuid.UUID], synced_until: Optional[datetime]) -> None:
+        """Ganti filter sekaligus, jti yang sudah expired ikut hilang dari filter"""
+        jtis = list(jtis)
+        bloom = BloomFilter(max(self.capacity, len(jtis) * 2), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti.bytes)
+        self.bloom = bloom
+        self.count = len(jtis)
+        self.version += 1
+        self.synced_until = synced_until
+        self._confirmed.clear()
+
+
+revocation_list = RevocationList(settings.REVOCATION_BLOOM_CAPACITY, settings.REVOCATION_BLOOM_ERROR_RATE)
@@ -1,19 +1,23 @@
 import base64
 from datetime import datetime, timedelta
-import os
-import shutil
 from uuid import uuid4
-from fastapi import Depends, HTTPException, UploadFile, status
+from fastapi import Depends, HTTPException, Request, UploadFile, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from app.core.database import async_session
+from app.core.database import async_session, read_session_for
 
 from jose import jwt, JWTError
 
-from app.schemas.sys_schema import TokenData
+from app.core.config import settings
+from app.core.read_your_writes import READ_PRIMARY
+from app.schemas.sys_schema import RoleEnum, TokenData
+from app.services.token_service import is_token_revoked
+from app.services.upload_service import UploadService
+from app.utils.token_cache import token_cache
 
-SECRET_KEY = os.getenv("SECRET_KEY", "temp_dashboard_rest_cuiiiii!!!!!!!!")
+SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
 async def get_db():
     async with async_session() as session:
@@ -21,54 +25,93 @@ async def get_db():
 
 bearer_scheme = HTTPBearer()
 
-async def get_current_user(creds: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="token tidak valid",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_token(token: str, token_type: str = "access") -> dict:
+    """Decode dan verifikasi JWT, token tanpa claim type dianggap access token lama"""
     try:
-        token = creds.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        role: str = payload.get("role")
-        if user_id is None:
-            raise credentials_exception
-        return TokenData(user_id=user_id, role=role)
-
     except JWTError:
-        raise credentials_exception
+        raise credentials_exception()
+    if payload.get("sub") is None or payload.get("type", "access") != token_type:
+        raise credentials_exception()
+    return payload
+
+async def get_current_user(creds: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
+    token = creds.credentials
+    key = token_cache.key(token)
+    token_data = token_cache.get(key)
+    if token_data is None:
+        payload = decode_token(token)
+        token_data = TokenData(user_id=payload["sub"], role=payload.get("role"), jti=payload.get("jti"))
+        expires_at = payload.get("exp")
+        # Token tanpa exp tidak di-cache supaya tidak hidup selamanya di memory
+        if expires_at is not None:
+            token_cache.set(key, float(expires_at), token_data)
+
+    # Token dari cache tetap dicek, revocation bisa datang setelah token di-cache
+    if await is_token_revoked(token_data.jti):
+        raise credentials_exception()
+    return token_data
+
+async def get_current_admin(user: TokenData = Depends(get_current_user)):
+    if user.role != RoleEnum.admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="hanya untuk admin")
+    return user
+
+def reads_primary(request: Request) -> bool:
+    """True kalau request membawa token read-your-writes yang masih berlaku"""
+    return request.scope.get("state", {}).get(READ_PRIMARY, False)
+
+async def get_read_db(request: Request, user: TokenData = Depends(get_current_user)):
+    """Session untuk handler read-only, diarahkan ke replica kecuali user baru saja write"""
+    async with read_session_for(user.user_id, reads_primary(request))() as session:
+        yield session
+
+async def get_write_db(request: Request, user: TokenData = Depends(get_current_user)):
+    """Session primary yang menandai user setelah commit supaya read berikutnya tetap ke primary"""
+    async with async_session() as session:
+        session.info["user_id"] = user.user_id
+        session.info["request_state"] = request.scope.setdefault("state", {})
+        yield session
 
 async def upload_photo(
     user: TokenData = Depends(get_current_user),
     file: UploadFile | None = None
 ):
-    print(f"masuk sini : {file}")
     if file:
-        print(f"masuk file : {file}")
-        upload_dir = f"uploads/{user.user_id}"
-        os.makedirs(upload_dir, exist_ok=True)
-
-        file_extension = file.filename.split(".")[-1]
-        unique_filename = f"{uuid4()}.{file_extension}"  
-        file_path = os.path.join(upload_dir, unique_filename)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        async with async_session() as session:
+            result = await UploadService(session).save(file, user)
+        return { "url": result["url"] }
 
-        return { "url": f"{upload_dir}/{unique_filename}" }
+def _create_token(data: dict, token_type: str, expires_delta: timedelta):
+    to_encode = data.copy()
+    to_encode.update({
+        "exp": datetime.utcnow() + expires_delta,
+        "jti": str(uuid4()),
+        "type": token_type,
+    })
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     try:
-        to_encode = data.copy()
-        expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-        return encoded_jwt
+        return _create_token(data, "access", expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     except Exception as e:
         print(f"error create_access_token : {e}")
         return None
 
+def create_refresh_token(data: dict, expires_delta: timedelta = None):
+    try:
+        return _create_token(data, "refresh", expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+    except Exception as e:
+        print(f"error create_refresh_token : {e}")
+        return None
+
 def get_basic_auth_header(username: str, password: str) -> dict:
     auth_value = f"{username}:{password}"
     encoded_auth = base64.b64encode(auth_value.encode()).decode("utf-8")
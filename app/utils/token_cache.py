@@ -0,0 +1,41 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.schemas.sys_schema import TokenData
+
+
+class TokenCache:
+    """LRU token yang sudah diverifikasi, key berupa SHA-256 token (token mentah tidak disimpan)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._tokens: "OrderedDict[bytes, Tuple[float, TokenData]]" = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[TokenData]:
+        cached = self._tokens.get(key)
+        if cached is None:
+            return None
+        expires_at, token_data = cached
+        if time.time() >= expires_at:
+            del self._tokens[key]
+            return None
+        self._tokens.move_to_end(key)
+        return token_data
+
+    def set(self, key: bytes, expires_at: float, token_data: TokenData) -> None:
+        if self.max_size <= 0:
+            return
+        self._tokens[key] = (expires_at, token_data)
+        self._tokens.move_to_end(key)
+        while len(self._tokens) > self.max_size:
+            self._tokens.popitem(last=False)
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
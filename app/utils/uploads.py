@@ -0,0 +1,149 @@
+import glob
+import hashlib
+import hmac
+import os
+import re
+import time
+from typing import BinaryIO, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+CHUNK_SIZE = 1024 * 1024
+
+# Layout: uploads/files/ab/cd/<key>.<ext>, dua level shard supaya satu folder tidak
+# berisi ratusan ribu file. key = HMAC(SECRET_KEY, user_id:sha256), jadi path tidak bisa
+# diturunkan dari isi file dan setiap user punya nama sendiri walaupun isinya sama
+FILES_DIR = os.path.join("uploads", "files")
+TMP_DIR = os.path.join("uploads", "tmp")
+FILE_URL_PATTERN = re.compile(r"files/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})\.")
+EXTENSION_PATTERN = re.compile(r"^[a-z0-9]{1,16}$")
+
+
+def too_large_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Ukuran file melebihi batas {settings.UPLOAD_MAX_BYTES} bytes",
+    )
+
+
+def file_extension(filename: Optional[str]) -> str:
+    """Ekstensi lowercase dari nama file, "bin" kalau kosong atau mengandung karakter aneh"""
+    name = filename or ""
+    extension = name.rsplit(".", 1)[-1].lower() if "." in name else ""
+    return extension if EXTENSION_PATTERN.match(extension) else "bin"
+
+
+def upload_key(user_id, sha256: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), f"{user_id}:{sha256}".encode(), hashlib.sha256).hexdigest()
+
+
+def upload_path(key: str, extension: str) -> str:
+    return os.path.join(FILES_DIR, key[:2], key[2:4], f"{key}.{extension}")
+
+
+def upload_url_key(url: Optional[str]) -> Optional[str]:
+    """Key dari file_url yang menunjuk ke folder files, None untuk url lama/eksternal"""
+    match = FILE_URL_PATTERN.search(url or "")
+    return match.group(1) if match else None
+
+
+def _upload_names(key: str) -> List[str]:
+    return glob.glob(os.path.join(FILES_DIR, key[:2], key[2:4], f"{key}.*"))
+
+
+def hash_file(source: BinaryIO, max_size: int) -> Tuple[int, str]:
+    """Hitung ukuran dan SHA-256 tanpa menulis apa pun, dijalankan di thread pool"""
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := source.read(CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_size:
+            raise too_large_exception()
+        digest.update(chunk)
+    return size, digest.hexdigest()
+
+
+def _copy_and_hash(source: BinaryIO, file_path: str, max_size: int) -> Tuple[int, str]:
+    """Salin per chunk sambil menghitung SHA-256, dijalankan di thread pool"""
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(file_path, "wb") as buffer:
+            while chunk := source.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise too_large_exception()
+                digest.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        # File setengah jadi tidak boleh tertinggal di folder upload
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    return size, digest.hexdigest()
+
+
+def store_upload(source: BinaryIO, key: str, extension: str, sha256: str, same_content: Iterable[str]) -> str:
+    """Tempatkan isi source di path untuk key, return path.
+
+    Kalau file dengan isi yang sama sudah ada (key ini dengan ekstensi lain, atau key
+    milik user lain di same_content) source tidak ditulis sama sekali, cukup hard link.
+    Pemanggil harus memegang lock per key supaya tidak balapan dengan GC.
+    """
+    path = upload_path(key, extension)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    candidates = _upload_names(key) + [name for other in same_content for name in _upload_names(other)]
+    for candidate in candidates:
+        try:
+            os.link(candidate, path)
+            return path
+        except FileExistsError:
+            return path
+        except FileNotFoundError:
+            # Baru saja dihapus GC, coba kandidat berikutnya atau tulis dari source
+            continue
+
+    os.makedirs(TMP_DIR, exist_ok=True)
+    tmp_path = os.path.join(TMP_DIR, f"{uuid4().hex}.tmp")
+    _, written = _copy_and_hash(source, tmp_path, settings.UPLOAD_MAX_BYTES)
+    if written != sha256:
+        os.remove(tmp_path)
+        raise Exception(f"Isi upload berubah saat disalin ({sha256} != {written})")
+    # Rename atomic, pembaca tidak pernah melihat file yang setengah jadi
+    os.replace(tmp_path, path)
+    return path
+
+
+def remove_upload(key: str) -> int:
+    """Hapus semua nama file untuk satu key, return jumlah file yang dihapus.
+
+    Isi file baru benar-benar hilang dari disk saat hard link terakhir dihapus.
+    """
+    removed = 0
+    for path in _upload_names(key):
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def remove_stale_tmp(max_age_seconds: float) -> int:
+    """Bersihkan file tmp yang tertinggal karena proses mati di tengah upload"""
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    for path in glob.glob(os.path.join(TMP_DIR, "*.tmp")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
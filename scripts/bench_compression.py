@@ -0,0 +1,68 @@
+"""Benchmark biaya CPU kompresi terhadap byte yang dihemat, tanpa database.
+
+    python -m scripts.bench_compression --rows 1000 --items 5 --runs 10
+
+Payload dibuat dengan render() seperti response GET /orders/, lalu dikompres dengan
+beberapa level gzip dan quality brotli (kalau paket brotli terpasang).
+"""
+import argparse
+import gzip
+import statistics
+import time
+from typing import List
+
+from app.schemas.order_schema import OrderWithItemsResponse
+from app.schemas.sys_schema import BaseResponse
+from app.utils.responses import render
+from scripts.bench_serialization import build_orders
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVELS = (1, 4, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+def measure(compress, body: bytes, runs: int):
+    timings = []
+    size = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        size = len(compress(body))
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), size
+
+
+def main(row_count: int, item_count: int, runs: int):
+    body = render(
+        BaseResponse[List[OrderWithItemsResponse]],
+        status="Success",
+        message="Berhasil mengambil data orders",
+        data=build_orders(row_count, item_count),
+    )
+    print(f"payload: {len(body)} bytes ({row_count} orders x {item_count} items)")
+
+    candidates = [(f"gzip-{level}", lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0)) for level in GZIP_LEVELS]
+    if brotli:
+        candidates += [(f"br-{quality}", lambda data, quality=quality: brotli.compress(data, quality=quality)) for quality in BROTLI_QUALITIES]
+    else:
+        print("brotli tidak terpasang, hanya gzip")
+
+    for label, compress in candidates:
+        median, size = measure(compress, body, runs)
+        saved = len(body) - size
+        print(
+            f"{label:>8}: {median * 1000:7.2f} ms, {size:>9} bytes, "
+            f"ratio {len(body) / size:5.1f}x, {saved / 1024 / (median * 1000):8.1f} KB saved/ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    main(args.rows, args.items, args.runs)
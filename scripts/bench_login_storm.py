@@ -0,0 +1,89 @@
+"""Latency endpoint lain selama login storm, terhadap server yang sedang berjalan.
+
+    python -m scripts.bench_login_storm --base-url http://localhost:8000 \
+        --email bench@example.com --password secret --logins 200 --concurrency 50
+
+Mengirim login secara paralel sambil terus memanggil --probe-path (default /docs,
+tidak menyentuh database) dan mencetak p50/p99 latency probe sebelum dan selama
+storm. Dengan bcrypt di event loop, p99 probe naik mendekati durasi satu hash
+dikali jumlah login yang antre; dengan thread pool, probe tetap dilayani.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+async def probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, timings: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get(path)
+        timings.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def login_storm(client: httpx.AsyncClient, email: str, password: str, count: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = []
+
+    async def login():
+        async with semaphore:
+            response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+            statuses.append(response.status_code)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(count)))
+    return time.perf_counter() - started, statuses
+
+
+async def measure_probe(client: httpx.AsyncClient, path: str, seconds: float):
+    timings = []
+    stop = asyncio.Event()
+    task = asyncio.create_task(probe(client, path, stop, timings))
+    await asyncio.sleep(seconds)
+    stop.set()
+    await task
+    return timings
+
+
+def report(label: str, timings):
+    print(
+        f"{label:>8}: probes={len(timings)} p50={statistics.median(timings):.1f}ms "
+        f"p99={percentile(timings, 0.99):.1f}ms max={max(timings):.1f}ms"
+    )
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 5)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=120) as client:
+        report("idle", await measure_probe(client, args.probe_path, 2))
+
+        timings = []
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, args.probe_path, stop, timings))
+        elapsed, statuses = await login_storm(client, args.email, args.password, args.logins, args.concurrency)
+        stop.set()
+        await probe_task
+
+        ok = sum(1 for status in statuses if status == 200)
+        print(f"logins: {ok}/{len(statuses)} ok in {elapsed:.2f}s ({len(statuses) / elapsed:.1f}/s)")
+        report("storm", timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probe-path", default="/docs")
+    args = parser.parse_args()
+    asyncio.run(main(args))
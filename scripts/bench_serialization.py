@@ -0,0 +1,102 @@
+"""Microbenchmark encoding response list orders, tanpa database.
+
+    python -m scripts.bench_serialization --rows 1000 --items 5 --runs 20
+
+Membandingkan jalur lama (model_validate per row, lalu FastAPI memvalidasi ulang
+terhadap response_model dan encode dengan json stdlib) dengan render() yang
+memvalidasi sekali dari objek ORM dan encode langsung ke bytes.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.schemas.order_schema import OrderWithItemsResponse
+from app.schemas.sys_schema import BaseResponse
+from app.utils.responses import render
+
+RESPONSE_TYPE = BaseResponse[List[OrderWithItemsResponse]]
+
+
+def build_orders(count: int, item_count: int):
+    """Objek dengan atribut seperti Order ORM yang sudah di-load beserta item dan user"""
+    user = SimpleNamespace(first_name="Bench", last_name="User", role="brand")
+    orders = []
+    for i in range(count):
+        id = uuid.uuid4()
+        orders.append(SimpleNamespace(
+            id=id,
+            order_id=f"ORD-{i:06d}",
+            user_id=uuid.uuid4(),
+            order_reference_number=f"REF-{i}",
+            issues_date=datetime.utcnow(),
+            due_date=datetime.utcnow(),
+            name=f"Customer {i}",
+            address="Jl. Bench No. 1",
+            receiver_name="Receiver",
+            address_2=None,
+            suburb="Suburb",
+            state="State",
+            post_code="12345",
+            phone_number="08123456789",
+            created_at=datetime.utcnow(),
+            user=user,
+            order_items=[
+                SimpleNamespace(id=uuid.uuid4(), order_id=id, product_name=f"Product {j}", order_qty=j + 1, file_url=None)
+                for j in range(item_count)
+            ],
+        ))
+    return orders
+
+
+async def encode_old(orders, field) -> bytes:
+    content = BaseResponse(
+        status="Success",
+        message="Berhasil mengambil data orders",
+        data=[OrderWithItemsResponse.model_validate(order) for order in orders],
+    )
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def encode_new(orders, field) -> bytes:
+    return render(RESPONSE_TYPE, status="Success", message="Berhasil mengambil data orders", data=orders)
+
+
+async def measure(encode, orders, field, runs: int):
+    timings = []
+    size = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        size = len(await encode(orders, field))
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), size
+
+
+async def main(row_count: int, item_count: int, runs: int):
+    orders = build_orders(row_count, item_count)
+    field = create_model_field(name="Response_get_orders", type_=RESPONSE_TYPE, mode="serialization")
+
+    for label, encode in (("old", encode_old), ("render", encode_new)):
+        await encode(orders, field)
+        median, size = await measure(encode, orders, field, runs)
+        print(
+            f"{label:>7}: median {median * 1000:.2f} ms, "
+            f"{median / row_count * 1e6:.1f} us/row, {size} bytes"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.items, args.runs))
@@ -0,0 +1,40 @@
+"""Bandingkan jwt.decode mentah dengan get_current_user yang memakai token cache.
+
+    python -m scripts.bench_token_cache --calls 100000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from app.utils.sys import ALGORITHM, SECRET_KEY, create_access_token, get_current_user
+
+
+def report(label: str, elapsed: float, calls: int):
+    print(f"{label:>18}: {elapsed * 1000:8.1f} ms total, {elapsed / calls * 1e6:6.2f} us/call")
+
+
+async def main(calls: int):
+    token = create_access_token({"sub": str(uuid.uuid4()), "role": "brand"})
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    report("jwt.decode", time.perf_counter() - started, calls)
+
+    await get_current_user(creds)
+    started = time.perf_counter()
+    for _ in range(calls):
+        await get_current_user(creds)
+    report("get_current_user", time.perf_counter() - started, calls)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=100000)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
@@ -0,0 +1,83 @@
+"""Benchmark OrderService.update_order pada order dengan banyak item.
+
+    python -m scripts.bench_update_order --user-id <uuid> --items 500 --runs 20
+
+Setiap run mengubah qty beberapa item, menambah satu item dan menghapus satu item,
+lalu mencatat durasi dan jumlah statement SQL yang dikirim.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.core.database import async_session, engine
+from app.schemas.order_schema import OrderCreate, OrderItemCreate, OrderUpdate
+from app.schemas.sys_schema import TokenData
+from app.services.order_service import OrderService
+
+
+def build_items(count: int, run: int):
+    items = [
+        OrderItemCreate(product_name=f"bench-product-{i}", order_qty=1, file_url=None)
+        for i in range(run, count + run)
+    ]
+    for item in items[:5]:
+        item.order_qty = run + 2
+    return items
+
+
+async def main(user_id: str, item_count: int, runs: int):
+    user = TokenData(user_id=user_id)
+    header = dict(
+        order_reference_number="bench",
+        issues_date=datetime.utcnow(),
+        due_date=datetime.utcnow(),
+        name="Bench Customer",
+        address="Bench Street 1",
+        receiver_name="Bench",
+        address_2=None,
+        suburb=None,
+        state=None,
+        post_code=None,
+        phone_number="000",
+    )
+
+    async with async_session() as session:
+        order = await OrderService(session).create_order(
+            OrderCreate(**header, order_items=build_items(item_count, 0)), user
+        )
+        order_id = order.id
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    timings, counts = [], []
+    for run in range(1, runs + 1):
+        statements.clear()
+        async with async_session() as session:
+            start = time.perf_counter()
+            await OrderService(session).update_order(
+                order_id, OrderUpdate(**header, order_items=build_items(item_count, run)), user
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+        counts.append(len(statements))
+
+    async with async_session() as session:
+        await OrderService(session).delete_order(order_id, user)
+    await engine.dispose()
+
+    timings.sort()
+    print(f"items={item_count} runs={runs} statements/update={statistics.mean(counts):.1f}")
+    print(f"median={statistics.median(timings):.2f}ms p95={timings[int(len(timings) * 0.95) - 1]:.2f}ms max={timings[-1]:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user-id", required=True)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id, args.items, args.runs))
@@ -0,0 +1,73 @@
+"""Upload paralel sambil mengukur latency endpoint lain, terhadap server yang sedang berjalan.
+
+    python -m scripts.bench_upload --base-url http://localhost:8000 --token <access token> \
+        --size-mb 200 --uploads 8 --concurrency 4
+
+Saat copy file masih sinkron di handler, p99 probe naik setara durasi copy satu file;
+dengan copy di thread pool, probe tetap dilayani selama upload berjalan.
+
+Tanpa --distinct semua upload berisi byte yang sama, sehingga hanya upload pertama
+yang ditulis ke disk dan sisanya cukup di-hash.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from scripts.bench_login_storm import measure_probe, probe, report
+
+
+async def upload_storm(
+    client: httpx.AsyncClient, token: str, payload: bytes, count: int, concurrency: int, distinct: bool = False
+):
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = []
+
+    async def upload(i: int):
+        body = i.to_bytes(8, "little") + payload[8:] if distinct else payload
+        async with semaphore:
+            response = await client.post(
+                "/api/v1/upload/",
+                files={"file": (f"bench-{i}.bin", body, "application/octet-stream")},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            statuses.append(response.status_code)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(upload(i) for i in range(count)))
+    return time.perf_counter() - started, statuses
+
+
+async def main(args):
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=600) as client:
+        report("idle", await measure_probe(client, args.probe_path, 2))
+
+        timings = []
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, args.probe_path, stop, timings))
+        elapsed, statuses = await upload_storm(
+            client, args.token, payload, args.uploads, args.concurrency, args.distinct
+        )
+        stop.set()
+        await probe_task
+
+        ok = sum(1 for status in statuses if status == 200)
+        total_mb = args.size_mb * len(statuses)
+        print(f"uploads: {ok}/{len(statuses)} ok in {elapsed:.2f}s ({total_mb / elapsed:.1f} MB/s)")
+        report("uploads", timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--probe-path", default="/docs")
+    parser.add_argument("--distinct", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args))
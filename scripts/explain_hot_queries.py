@@ -0,0 +1,73 @@
+"""EXPLAIN ANALYZE untuk query-query paling sering dipanggil.
+
+Jalankan sebelum dan sesudah `alembic upgrade head` lalu bandingkan hasilnya:
+
+    python -m scripts.explain_hot_queries --user-id <uuid> > before.txt
+    alembic upgrade head
+    python -m scripts.explain_hot_queries --user-id <uuid> > after.txt
+"""
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+HOT_QUERIES = {
+    "get_orders (deep page)": (
+        "SELECT * FROM orders WHERE user_id = :user_id "
+        "ORDER BY created_at DESC, id DESC OFFSET :skip LIMIT :limit"
+    ),
+    "get_products": (
+        "SELECT * FROM products WHERE user_id = :user_id "
+        "ORDER BY created_at DESC, id DESC OFFSET :skip LIMIT :limit"
+    ),
+    "get_customers": (
+        "SELECT * FROM customers WHERE user_id = :user_id "
+        "ORDER BY created_at DESC, id DESC OFFSET :skip LIMIT :limit"
+    ),
+    "order_items selectin": (
+        "SELECT * FROM order_items WHERE order_id IN "
+        "(SELECT id FROM orders WHERE user_id = :user_id LIMIT :limit)"
+    ),
+    "customer by name": (
+        "SELECT * FROM customers WHERE user_id = :user_id AND lower(name) = lower(:name)"
+    ),
+    "product by name (ilike)": (
+        "SELECT * FROM products WHERE name ILIKE :name"
+    ),
+}
+
+
+async def main(user_id: str, name: str, skip: int, limit: int, runs: int):
+    params = {"user_id": user_id, "name": name, "skip": skip, "limit": limit}
+    async with engine.connect() as conn:
+        for label, sql in HOT_QUERIES.items():
+            timings = []
+            plan = None
+            for _ in range(runs):
+                result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params)
+                raw = result.scalar_one()
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+                timings.append(plan["Execution Time"])
+            timings.sort()
+            root = plan["Plan"]
+            print(f"== {label}")
+            print(f"   node={root['Node Type']} rows={root.get('Actual Rows')} "
+                  f"min={timings[0]:.3f}ms median={timings[len(timings) // 2]:.3f}ms max={timings[-1]:.3f}ms")
+            result = await conn.execute(text(f"EXPLAIN {sql}"), params)
+            for line in result.scalars():
+                print(f"   {line}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user-id", required=True)
+    parser.add_argument("--name", default="test")
+    parser.add_argument("--skip", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id, args.name, args.skip, args.limit, args.runs))
@@ -0,0 +1,58 @@
+"""Stress test generate_order_id dengan banyak task bersamaan.
+
+    python -m scripts.stress_order_id --concurrency 50 --total 2000
+    python -m scripts.stress_order_id --concurrency 50 --total 2000 --block-size 100
+
+Gagal (exit 1) kalau ada order_id yang duplikat atau ada error.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models import order_models
+
+
+async def worker(queue: asyncio.Queue, results: list, errors: list):
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        try:
+            results.append(await order_models.generate_order_id())
+        except Exception as e:
+            errors.append(e)
+
+
+async def main(concurrency: int, total: int, block_size: int):
+    settings.ORDER_ID_BLOCK_SIZE = block_size
+    order_models._block_allocator = order_models.OrderSequenceBlockAllocator(block_size)
+
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+    results, errors = [], []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(queue, results, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+
+    duplicates = len(results) - len(set(results))
+    print(f"generated={len(results)} errors={len(errors)} duplicates={duplicates} "
+          f"elapsed={elapsed:.2f}s rate={len(results) / elapsed:.0f}/s")
+    for e in errors[:5]:
+        print(f"  error: {e}")
+    return 1 if errors or duplicates else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--total", type=int, default=2000)
+    parser.add_argument("--block-size", type=int, default=1)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.concurrency, args.total, args.block_size)))
@@ -0,0 +1,78 @@
+"""order_id harus unik walaupun banyak order dibuat bersamaan.
+
+Sequence direservasi di transaksi pendek sendiri (bukan transaksi request), jadi test
+ini juga memastikan reservasi tidak bentrok dengan row lock order_sequences.
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+CONCURRENT_ORDERS = 20
+
+
+def _order_payload(i: int) -> dict:
+    return {
+        "order_reference_number": f"CONCURRENT-{i}",
+        "issues_date": "2025-01-01T00:00:00",
+        "due_date": "2025-01-08T00:00:00",
+        "name": f"Concurrent Customer {i % 3}",
+        "address": "Jalan Paralel",
+        "receiver_name": "Receiver",
+        "address_2": None,
+        "suburb": None,
+        "state": None,
+        "post_code": None,
+        "phone_number": "08123",
+        "order_items": [{"product_name": "Product 0", "order_qty": 1, "file_url": None}],
+    }
+
+
+@pytest_asyncio.fixture
+async def user_client(engine):
+    """Client untuk user baru, supaya order dari test ini tidak mengubah data seed"""
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.database import async_session
+    from app.main import app
+    from app.models import User
+    from app.utils.sys import create_access_token
+
+    async with async_session() as session:
+        user = User(email="order-id@example.com", password="-", first_name="Order", last_name="Id")
+        session.add(user)
+        await session.commit()
+
+    token = create_access_token({"sub": str(user.id), "role": "admin"})
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_get_unique_order_ids(user_client):
+    responses = await asyncio.gather(*(
+        user_client.post("/api/v1/orders/", json=_order_payload(i)) for i in range(CONCURRENT_ORDERS)
+    ))
+
+    assert all(response.status_code == 200 for response in responses), [r.text for r in responses]
+    order_ids = [response.json()["data"]["order_id"] for response in responses]
+    assert len(set(order_ids)) == CONCURRENT_ORDERS
+
+
+@pytest.mark.asyncio
+async def test_block_allocator_gives_unique_ids(engine, monkeypatch):
+    from app.models import order_models
+
+    monkeypatch.setattr(order_models.settings, "ORDER_ID_BLOCK_SIZE", 5)
+    monkeypatch.setattr(order_models, "_block_allocator", order_models.OrderSequenceBlockAllocator(5))
+
+    batches = await asyncio.gather(*(
+        order_models.generate_order_ids(3) for _ in range(CONCURRENT_ORDERS)
+    ))
+
+    order_ids = [order_id for batch in batches for order_id in batch]
+    assert len(set(order_ids)) == len(order_ids) == CONCURRENT_ORDERS * 3
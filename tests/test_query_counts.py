@@ -0,0 +1,38 @@
+"""Jumlah statement SQL per endpoint read harus tetap, tidak tumbuh dengan jumlah row.
+
+Setiap endpoint membaca resource_versions sekali untuk ETag (cached_response), lalu
+query data-nya sendiri. Order memuat user lewat joinedload dan order_items lewat
+selectinload, jadi list maupun detail order selalu 2 query data.
+"""
+import pytest
+
+ENDPOINT_STATEMENTS = [
+    ("/api/v1/orders/", 3),
+    ("/api/v1/orders/{order}", 3),
+    ("/api/v1/products/", 2),
+    ("/api/v1/products/{product}", 2),
+    ("/api/v1/customers/", 2),
+    ("/api/v1/customers/{customer}", 2),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, expected", ENDPOINT_STATEMENTS)
+async def test_read_endpoint_statement_count(client, seed, statements, path, expected):
+    with statements() as captured:
+        response = await client.get(path.format(**seed))
+
+    assert response.status_code == 200, response.text
+    assert len(captured) == expected, "\n\n".join(captured)
+
+
+@pytest.mark.asyncio
+async def test_order_list_loads_items_and_user(client, seed, statements):
+    with statements() as captured:
+        response = await client.get("/api/v1/orders/")
+
+    orders = response.json()["data"]
+    assert len(orders) == 3
+    assert all(len(order["order_items"]) == 2 for order in orders)
+    assert all(order["user"]["first_name"] == "Query" for order in orders)
+    assert len(captured) == 3